@@ -31,6 +31,7 @@ from typing import List, Optional, Tuple, Union
 
 from camelot.admin.action import State
 from camelot.admin.admin_route import AdminRoute, Route, RouteWithRenderHint
+from camelot.core.cache import field_attributes_changes
 from camelot.core.item_model.proxy import AbstractModelProxy
 from camelot.core.utils import ugettext_lazy
 
@@ -56,6 +57,28 @@ class AbstractAdmin(AdminRoute, ABC):
     def get_static_field_attributes(self, field_names):
         """Return the static field attributes for the given field names."""
 
+    def get_cached_static_field_attributes(self, field_names) -> List[dict]:
+        """Return a list with the static field attributes for the given field
+        names, computed in a single call of :meth:`get_static_field_attributes`
+        for the fields not requested before.
+
+        The field attributes are kept until the field attributes of the admin
+        change, as counted by :data:`camelot.core.cache.field_attributes_changes`,
+        and should not be modified.
+        """
+        field_names = list(field_names)
+        version = field_attributes_changes.get(self)
+        if version is None:
+            return list(self.get_static_field_attributes(field_names))
+        cached_version, attributes = self.__dict__.get('_static_field_attributes_cache', (None, None))
+        if cached_version != version:
+            attributes = dict()
+            self._static_field_attributes_cache = (version, attributes)
+        missing = [field_name for field_name in dict.fromkeys(field_names) if field_name not in attributes]
+        if missing:
+            attributes.update(zip(missing, self.get_static_field_attributes(missing)))
+        return [attributes[field_name] for field_name in field_names]
+
     @abstractmethod
     def get_list_action(self) -> Route:
         """Return the list action route for this admin."""
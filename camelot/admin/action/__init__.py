@@ -28,7 +28,7 @@
 #  ============================================================================
 
 from .application_action import ApplicationActionModelContext
-from .base import ActionStep, Mode, State, RenderHint
+from .base import ActionStep, Mode, State, StateDependency, RenderHint
 
 __all__ = [
     ActionStep.__name__,
@@ -36,4 +36,5 @@ __all__ = [
     Mode.__name__,
     RenderHint.__name__,
     State.__name__,
+    StateDependency.__name__,
     ]
@@ -201,6 +201,15 @@ return immediately and the :meth:`model_run` will not be blocked.
     def model_run( self, model_context, mode ):
         raise Exception('This should not happen')
 
+    def background_steps(self):
+        """
+        :return: `None`, or a generator of non blocking action steps to be
+            sent to the GUI while this blocking action step waits for its
+            result.  The generator is advanced each time the model thread is
+            idle, and closed when the action step no longer waits.
+        """
+        return None
+
     @classmethod
     def deserialize_result(cls, model_context: ModelContext, serialized_result):
         """
@@ -217,6 +226,22 @@ return immediately and the :meth:`model_run` will not be blocked.
         return serialized_result
 
 
+class StateDependency(Enum):
+    """
+    What the state of an action depends on, actions declare the dependencies
+    of their state in their `state_dependencies` attribute, a set of
+    :class:`StateDependency` members.  When none of those changed, the
+    previously computed state of the action is reused.
+    """
+
+    #: the selected rows, and the objects in them
+    SELECTION = 'selection'
+    #: the rows in the collection, and the objects in them
+    COLLECTION = 'collection'
+    #: the current row and field
+    CURRENT_ROW = 'current_row'
+
+
 class RenderHint(Enum):
     """
     How an action wants to be rendered in the ui
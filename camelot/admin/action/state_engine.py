@@ -0,0 +1,158 @@
+#  ============================================================================
+#
+#  Copyright (C) 2007-2016 Conceptive Engineering bvba.
+#  www.conceptive.be / info@conceptive.be
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#      * Redistributions of source code must retain the above copyright
+#        notice, this list of conditions and the following disclaimer.
+#      * Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#      * Neither the name of Conceptive Engineering nor the
+#        names of its contributors may be used to endorse or promote products
+#        derived from this software without specific prior written permission.
+#  
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+#  ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+#  WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL <COPYRIGHT HOLDER> BE LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#  (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+#  LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+#  ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#  ============================================================================
+
+"""Evaluation of the states of actions, reusing the states of actions of
+which the dependencies did not change.
+"""
+
+import weakref
+
+from camelot.admin.action.base import StateDependency
+from camelot.core.cache import entity_changes
+from camelot.core.naming import initial_naming_context
+
+
+def _proxy_key(model_context):
+    proxy = getattr(model_context, 'proxy', None)
+    return (id(proxy), getattr(proxy, 'mutation_count', None))
+
+def _selection_key(model_context):
+    selected_rows = getattr(model_context, 'selected_rows', None)
+    return (
+        _proxy_key(model_context),
+        getattr(model_context, 'selection_count', None),
+        tuple(selected_rows) if selected_rows is not None else None,
+        entity_changes.version,
+    )
+
+def _collection_key(model_context):
+    return (
+        _proxy_key(model_context),
+        getattr(model_context, 'collection_count', None),
+        entity_changes.version,
+    )
+
+def _current_row_key(model_context):
+    return (
+        getattr(model_context, 'current_row', None),
+        getattr(model_context, 'current_field_name', None),
+    )
+
+
+class ActionStateEngine(object):
+    """
+    Evaluates the states of a batch of actions in a model context.
+
+    Actions declare what their state depends on with a `state_dependencies`
+    attribute, a set of :class:`camelot.admin.action.base.StateDependency`
+    members.  The state of an action is kept per model context, and reused
+    as long as none of its dependencies changed.  The states of actions
+    without a `state_dependencies` attribute are always recomputed, those
+    with an empty set of dependencies are only computed once.
+
+    The dependencies are compared with keys computed once per batch :
+
+    * the selection : the proxy and its mutation count, the selected rows,
+      and the version of :data:`camelot.core.cache.entity_changes`
+    * the collection : the proxy and its mutation count, the number of rows,
+      and the version of :data:`camelot.core.cache.entity_changes`
+    * the current row : the current row and field name
+
+    Reused states are shared and should not be modified.
+
+    .. attribute:: hits
+
+        the number of states that were reused
+
+    .. attribute:: misses
+
+        the number of states that were computed
+    """
+
+    dependency_keys = {
+        StateDependency.SELECTION: _selection_key,
+        StateDependency.COLLECTION: _collection_key,
+        StateDependency.CURRENT_ROW: _current_row_key,
+    }
+
+    def __init__(self):
+        self._states = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def get_states(self, model_context, routes):
+        """
+        :param model_context: the model context in which the actions are
+            evaluated
+        :param routes: an iterable over the routes of the actions
+        :return: a list of `(route, state)` tuples, in the order of the routes
+        """
+        try:
+            cached_states = self._states.setdefault(model_context, dict())
+        except TypeError:
+            cached_states = dict()
+        keys = dict()
+        action_states = []
+        for route in routes:
+            action = initial_naming_context.resolve(route)
+            dependencies = getattr(action, 'state_dependencies', None)
+            if dependencies is None:
+                state = action.get_state(model_context)
+                self.misses += 1
+            else:
+                for dependency in dependencies:
+                    if dependency not in keys:
+                        keys[dependency] = self.dependency_keys[dependency](model_context)
+                key = tuple(keys[dependency] for dependency in sorted(dependencies, key=lambda d: d.value))
+                cached = cached_states.get(route)
+                if cached is not None and cached[0] is action and cached[1] == key:
+                    state = cached[2]
+                    self.hits += 1
+                else:
+                    state = action.get_state(model_context)
+                    cached_states[route] = (action, key, state)
+                    self.misses += 1
+            action_states.append((route, state))
+        return action_states
+
+    def invalidate(self, model_context=None):
+        """
+        Recompute the states of the actions in a model context the next time
+        they are requested.
+
+        :param model_context: the model context, `None` to invalidate the
+            states in all model contexts
+        """
+        if model_context is None:
+            self._states.clear()
+        else:
+            self._states.pop(model_context, None)
+
+
+state_engine = ActionStateEngine()
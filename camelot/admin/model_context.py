@@ -1,7 +1,155 @@
-from ..core.cache import ValueCache
+import collections
+import time
+import weakref
+
+from ..core.cache import SharedValueCache, ValueCache, entity_rows, entity_version_stamp
+from ..core.qt import QtCore
 from .action.application_action import ApplicationActionModelContext
 
 
+def _schedule_idle(callback):
+    """Call the callback when the event loop of the current thread is idle"""
+    QtCore.QTimer.singleShot(0, callback)
+
+
+class RowPrefetcher(object):
+    """
+    Fill the item cache of an :class:`ObjectsModelContext` with row data
+    ahead of the rows the view is requesting.
+
+    The prefetcher watches the row ranges requested by the view, to predict
+    the direction and speed of scrolling.  The rows ahead of the viewport are
+    then computed in small chunks, each chunk being scheduled when the event
+    loop of the model thread is idle, so requests of the view are handled
+    in between chunks, and the session is never used outside the model
+    thread.
+
+    Pending prefetch work is cancelled when the view jumps to another part
+    of the collection or reverses its scroll direction, and stops when the
+    model context is garbage collected after the view was closed.
+
+    :param model_context: the :class:`ObjectsModelContext` of the view
+    :param compute_row_data: a function that takes the model context, a row
+        and the object on that row, and returns the row data to be stored
+        in the item cache, for the columns returned by
+        :meth:`ObjectsModelContext.get_missing_columns`.
+    :param schedule: a function that takes a callable, and calls it when the
+        model thread is idle
+    """
+
+    # the number of requests used to estimate the scroll speed
+    history = 4
+    # the number of pages to prefetch when the view scrolls slowly
+    pages_ahead = 2
+    # the number of seconds of scrolling at the current speed to prefetch
+    seconds_ahead = 0.5
+    # the number of rows computed in a single chunk
+    chunk_size = 10
+
+    def __init__(self, model_context, compute_row_data, schedule=_schedule_idle):
+        self._model_context = weakref.ref(model_context)
+        self.compute_row_data = compute_row_data
+        self.schedule = schedule
+        self.requests = collections.deque(maxlen=self.history)
+        # the generation is incremented each time pending work is cancelled,
+        # scheduled chunks of older generations stop running
+        self.generation = 0
+        self.pending = collections.deque()
+        self.prefetched = 0
+
+    def cancel(self):
+        """Cancel all pending prefetch work"""
+        self.generation += 1
+        self.pending.clear()
+
+    def rows_requested(self, first_row, last_row):
+        """
+        Register the range of rows requested by the view, and schedule the
+        rows ahead of it to be prefetched.
+
+        :param first_row: the first row requested, inclusive
+        :param last_row: the last row requested, inclusive
+        """
+        now = time.monotonic()
+        page_size = last_row - first_row + 1
+        if self.requests:
+            _time, previous_first, previous_last = self.requests[-1]
+            previous_direction = self.direction()
+            jump = page_size * (self.pages_ahead + 1)
+            direction = (first_row > previous_first) - (first_row < previous_first)
+            if (first_row > previous_last + jump) or (last_row < previous_first - jump) or (
+                direction and previous_direction and direction != previous_direction):
+                self.cancel()
+                self.requests.clear()
+        self.requests.append((now, first_row, last_row))
+        self._schedule_rows(page_size)
+
+    def direction(self):
+        """
+        :return: 1 if the view scrolls down, -1 if it scrolls up, 0 if the
+            direction is unknown
+        """
+        if len(self.requests) < 2:
+            return 0
+        first, last = self.requests[0][1], self.requests[-1][1]
+        return (last > first) - (last < first)
+
+    def speed(self):
+        """
+        :return: the estimated number of rows scrolled per second
+        """
+        if len(self.requests) < 2:
+            return 0
+        (first_time, first_row, _), (last_time, last_row, _) = self.requests[0], self.requests[-1]
+        if last_time <= first_time:
+            return 0
+        return abs(last_row - first_row) / (last_time - first_time)
+
+    def _schedule_rows(self, page_size):
+        model_context = self._model_context()
+        direction = self.direction()
+        if model_context is None or direction == 0:
+            return
+        _time, first_row, last_row = self.requests[-1]
+        rows_ahead = max(page_size * self.pages_ahead, int(self.speed() * self.seconds_ahead))
+        # never prefetch more than half the cache, to keep the viewport cached
+        rows_ahead = min(rows_ahead, model_context.item_cache.max_entries // 2)
+        if direction > 0:
+            rows = range(last_row + 1, min(last_row + 1 + rows_ahead, model_context.collection_count))
+        else:
+            rows = range(first_row - 1, max(first_row - 1 - rows_ahead, -1), -1)
+        cached_rows = model_context.item_cache.rows()
+        self.pending.clear()
+        self.pending.extend(row for row in rows if row not in cached_rows)
+        if self.pending:
+            generation = self.generation
+            self.schedule(lambda: self._prefetch_chunk(generation))
+
+    def _prefetch_chunk(self, generation):
+        model_context = self._model_context()
+        if model_context is None or generation != self.generation or not self.pending:
+            return
+        rows = [self.pending.popleft() for _i in range(min(self.chunk_size, len(self.pending)))]
+        first_row, last_row = min(rows), max(rows)
+        cached_rows = model_context.item_cache.rows()
+        for row, obj in zip(range(first_row, last_row + 1), model_context.proxy[first_row:last_row + 1]):
+            if row in cached_rows:
+                continue
+            stamp = model_context.get_version_stamp(obj)
+            if model_context.item_cache.unchanged(row, obj, stamp) is not None:
+                if not model_context.get_missing_columns(row):
+                    continue
+            model_context.item_cache.add_data(
+                row, obj, self.compute_row_data(model_context, row, obj), stamp
+            )
+            # the row data is sent when the view requests the row
+            model_context.item_cache.mark_unsent(obj)
+            self.prefetched += 1
+        if self.pending:
+            self.schedule(lambda: self._prefetch_chunk(generation))
+
+
+
 class ObjectsModelContext(ApplicationActionModelContext):
     """On top of the attributes of the 
     :class:`camelot.admin.action.application_action.ApplicationActionModelContext`, 
@@ -57,14 +205,62 @@ class ObjectsModelContext(ApplicationActionModelContext):
     :meth:`model_run` to quickly evaluate the size of the collection or the
     selection without calling the potentially time consuming methods
     :meth:`get_collection` and :meth:`get_selection`.
+
+    .. attribute:: item_cache
+
+        A :class:`camelot.core.cache.ValueCache` with the row data sent to
+        the view, sized with :meth:`resize_item_cache` to the number of
+        rows the view shows.  The item cache is registered in the process
+        wide :class:`camelot.core.cache.EntityRowIndex`, see :meth:`get_rows`.
+
+    .. attribute:: sent_cells
+
+        A `dict` with the cells last sent to the view, to send only the
+        changes of cells in a :class:`camelot.view.crud_action.DataUpdate`.
+        The cells of a row are forgotten when the row is removed from the
+        item cache.
+
+    .. attribute:: changed_rows
+
+        A `set` with the rows of which the shared row data was invalidated
+        because their objects changed, see :meth:`rows_changed`.
+
+    .. attribute:: visible_columns
+
+        A `frozenset` with the columns visible in the view, as reported by
+        the view with :meth:`set_visible_columns`, `None` as long as the view
+        did not report its visible columns.  Row data is only computed for
+        the visible columns, the other columns are filled when they become
+        visible.
     """
+
+    # the number of pages of visible rows kept in the item cache
+    item_cache_pages = 3
+    # the minimum number of rows kept in the item cache
+    item_cache_rows = 100
+    # the maximum approximate number of bytes used by the item cache
+    item_cache_bytes = None
+    # the type of item cache, use ColumnarValueCache for wide tables, or
+    # SharedValueCache to share row data with other views of the same admin
+    item_cache_class = ValueCache
+    # the prefetcher used when prefetching is enabled
+    prefetcher_class = RowPrefetcher
+    # store version stamps of the objects in the item cache, so the row data
+    # of objects with an unchanged stamp is not recomputed
+    version_stamps = False
     
     def __init__(self, admin, proxy, locale, collection=None):
         super().__init__(admin)
         self.proxy = proxy
         self.locale = locale
-        self.item_cache = ValueCache(100)
+        self.item_cache = self._new_item_cache()
+        self.sent_cells = dict()
+        self.changed_rows = set()
         self.static_field_attributes = []
+        self.visible_columns = None
+        # the static field attributes of which the default visible columns
+        # were computed, together with those columns
+        self._default_visible_columns = (None, None)
         self.current_row = None
         self.current_column = None
         self.current_field_name = None
@@ -76,6 +272,257 @@ class ObjectsModelContext(ApplicationActionModelContext):
         # self.obj = None
         # todo : remove the concept of a validator (taken from CollectionProxy)
         self.validator = admin.get_validator() if admin is not None else None
+        self.prefetcher = None
+        # incremented each time a proxy job is started, to cancel older jobs
+        self.proxy_job_generation = 0
+
+    def _new_item_cache(self):
+        if issubclass(self.item_cache_class, SharedValueCache):
+            item_cache = self.item_cache_class(
+                self.item_cache_rows, self.item_cache_bytes, key=self.admin
+            )
+        else:
+            item_cache = self.item_cache_class(self.item_cache_rows, self.item_cache_bytes)
+        item_cache.row_removed = self._forget_sent_cells
+        entity_rows.register(item_cache, self)
+        return item_cache
+
+    def _forget_sent_cells(self, row):
+        for column in range(len(self.static_field_attributes)):
+            self.sent_cells.pop((row, column), None)
+
+    @staticmethod
+    def get_rows(objects):
+        """
+        Find the model contexts and rows in which objects are displayed,
+        without searching all open views.
+
+        :param objects: an iterable over objects that were changed
+        :return: a `dict` mapping each :class:`ObjectsModelContext` that
+            displays one of the objects to a sorted list of `(row, obj)` tuples
+        """
+        return entity_rows.rows(objects)
+
+    def resize_item_cache(self, visible_rows):
+        """
+        Size the item cache to the number of rows shown by the view, so
+        scrolling back and forth over a few pages does not require the
+        row data to be recomputed.
+
+        :param visible_rows: the number of rows visible in the view
+        """
+        self.item_cache.resize(
+            max(self.item_cache_rows, visible_rows * self.item_cache_pages),
+            self.item_cache_bytes
+        )
+
+    def reset_item_cache(self):
+        """
+        Clear the item cache and forget the cells sent to the view, when the
+        view requests all rows again.
+        """
+        self.item_cache.clear()
+        self.sent_cells.clear()
+
+    def rows_changed(self, rows):
+        """
+        Inform the model context that the objects on some rows changed, when
+        the row data shared with other views was invalidated.
+
+        :param rows: an iterable over the changed rows
+        """
+        self.changed_rows.update(rows)
+
+    def take_changed_rows(self):
+        """
+        :return: a sorted list of the rows that changed since the previous
+            call, to be requested again by the view
+        """
+        rows = sorted(self.changed_rows)
+        self.changed_rows.clear()
+        return rows
+
+    def enable_prefetch(self, compute_row_data):
+        """
+        Fill the item cache ahead of the rows requested by the view.
+
+        :param compute_row_data: a function that takes the model context, a
+            row and the object on that row, and returns the row data to be
+            stored in the item cache.
+        """
+        self.prefetcher = self.prefetcher_class(self, compute_row_data)
+
+    def rows_requested(self, first_row, last_row):
+        """
+        Inform the model context of the range of rows the view requests, this
+        is used to prefetch the rows ahead of the viewport.
+
+        :param first_row: the first row requested, inclusive
+        :param last_row: the last row requested, inclusive
+        """
+        if self.prefetcher is not None:
+            self.prefetcher.rows_requested(first_row, last_row)
+
+    def set_visible_columns(self, columns):
+        """
+        Inform the model context of the columns visible in the view, because
+        the user hid or showed columns, or scrolled horizontally.
+
+        :param columns: an iterable over the visible columns
+        :return: a sorted list of the columns that became visible, and of
+            which the data of the cached rows should be computed
+        """
+        previous = self.get_visible_columns()
+        self.visible_columns = frozenset(columns)
+        if previous is None:
+            return []
+        return sorted(self.visible_columns - previous)
+
+    def get_visible_columns(self):
+        """
+        :return: a `frozenset` with the columns for which row data should be
+            computed, `None` if the data of all columns should be computed.
+            As long as the view did not report its visible columns, those are
+            the columns of the admin that are visible by default, not the
+            extra columns.
+        """
+        if self.visible_columns is not None:
+            return self.visible_columns
+        static_field_attributes, visible_columns = self._default_visible_columns
+        if static_field_attributes is not self.static_field_attributes:
+            visible_columns = None
+            if self.static_field_attributes:
+                default_columns = set(self.admin.get_columns())
+                visible_columns = frozenset(
+                    column for column, fa in enumerate(self.static_field_attributes)
+                    if fa['field_name'] in default_columns
+                )
+            self._default_visible_columns = (self.static_field_attributes, visible_columns)
+        return visible_columns
+
+    def get_missing_columns(self, row):
+        """
+        :param row: the row of which the data is requested
+        :return: a sorted list of the visible columns of which there is no
+            data for the row in the item cache, `None` if all columns are
+            visible and there is no data for the row
+        """
+        visible_columns = self.get_visible_columns()
+        cached_columns = self.item_cache.get_data(row).keys()
+        if visible_columns is None:
+            if cached_columns:
+                return sorted(set(range(len(self.static_field_attributes))) - cached_columns)
+            return None
+        return sorted(visible_columns - cached_columns)
+
+    def get_version_stamp(self, obj):
+        """
+        :return: the version stamp of an object, to be stored together with
+            its row data in the item cache, `None` if version stamps are not
+            used
+        """
+        if self.version_stamps:
+            return entity_version_stamp(obj)
+
+    def count_exact(self, callback, schedule=_schedule_idle):
+        """
+        When the length of the proxy is an estimate, count the exact number
+        of rows when the model thread is idle, so the view can show a
+        scrollbar without waiting for the exact count.
+
+        :param callback: a function that takes the exact number of rows,
+            called after :attr:`collection_count` has been updated
+        :param schedule: a function that takes a callable, and calls it when
+            the model thread is idle
+        """
+        if self.proxy.length_is_exact():
+            return
+        model_context_ref = weakref.ref(self)
+        proxy = self.proxy
+
+        def count():
+            model_context = model_context_ref()
+            # the view might have been closed or its proxy replaced
+            if (model_context is None) or (model_context.proxy is not proxy):
+                return
+            model_context.collection_count = proxy.exact_length()
+            callback(model_context.collection_count)
+
+        schedule(count)
+
+    def sort_proxy(self, callback, key=None, reverse=False, schedule=_schedule_idle):
+        """
+        Sort the proxy in the background, see :meth:`run_proxy_job`.
+
+        :param key: the `key` argument of
+            :meth:`camelot.core.item_model.AbstractModelProxy.sort`
+        :param reverse: the `reverse` argument of
+            :meth:`camelot.core.item_model.AbstractModelProxy.sort`
+        """
+        self.run_proxy_job(lambda proxy: proxy.sort_job(key, reverse), callback, schedule)
+
+    def filter_proxy(self, callback, key, value, schedule=_schedule_idle):
+        """
+        Filter the proxy in the background, see :meth:`run_proxy_job`.
+
+        :param key: the `key` argument of
+            :meth:`camelot.core.item_model.AbstractModelProxy.filter`
+        :param value: the `value` argument of
+            :meth:`camelot.core.item_model.AbstractModelProxy.filter`
+        """
+        self.run_proxy_job(lambda proxy: proxy.filter_job(key, value), callback, schedule)
+
+    def run_proxy_job(self, job, callback, schedule=_schedule_idle):
+        """
+        Run a sort or filter job on a copy of the proxy, one step each time
+        the model thread is idle.  The current proxy keeps serving the rows
+        requested by the view until the job is done, then the copy replaces
+        the proxy.  Running a new job cancels the job that is running.
+
+        If objects are appended to or removed from the proxy while the job
+        runs, the job is restarted on a new copy of the proxy.
+
+        :param job: a function that takes a proxy, and returns a generator
+            that sorts or filters the proxy in steps
+        :param callback: a function that takes the new proxy, called after
+            it replaced the old proxy
+        :param schedule: a function that takes a callable, and calls it when
+            the model thread is idle
+        """
+        self.proxy_job_generation += 1
+        generation = self.proxy_job_generation
+        model_context_ref = weakref.ref(self)
+        proxy = self.proxy
+        length = len(proxy)
+        new_proxy = proxy.copy()
+        steps = job(new_proxy)
+
+        def step():
+            model_context = model_context_ref()
+            if (model_context is None) or (model_context.proxy_job_generation != generation):
+                steps.close()
+                return
+            try:
+                next(steps)
+            except StopIteration:
+                if (model_context.proxy is not proxy) or (len(proxy) != length):
+                    model_context.run_proxy_job(job, callback, schedule)
+                    return
+                model_context.proxy = new_proxy
+                model_context.collection_count = len(new_proxy)
+                # the rows of the objects changed
+                model_context.cancel_prefetch()
+                model_context.reset_item_cache()
+                callback(new_proxy)
+                return
+            schedule(step)
+
+        schedule(step)
+
+    def cancel_prefetch(self):
+        """Cancel pending prefetch work, for example when the view closes"""
+        if self.prefetcher is not None:
+            self.prefetcher.cancel()
 
     def get_selection( self, yield_per = None ):
         """
@@ -87,7 +534,7 @@ class ObjectsModelContext(ApplicationActionModelContext):
         # change, while the selection remains the same, so we should
         # be careful when using the collection to generate selection data
         for (first_row, last_row) in self.selected_rows:
-            for obj in self.proxy[first_row:last_row + 1]:
+            for obj in self.proxy.__getitem__(slice(first_row, last_row + 1), yield_per):
                 yield obj
 
     def get_collection( self, yield_per = None ):
@@ -96,7 +543,7 @@ class ObjectsModelContext(ApplicationActionModelContext):
             should fetched from the database at the same time.
         :return: a generator over the objects in the list
         """
-        for obj in self.proxy[0:self.collection_count]:
+        for obj in self.proxy.__getitem__(slice(0, self.collection_count), yield_per):
             yield obj
             
     def get_object( self, row = None ):
@@ -28,6 +28,169 @@
 #  ============================================================================
 
 import collections
+import itertools
+import sys
+import weakref
+
+
+class ChangeCounter(object):
+    """
+    Counts the changes of each entity as reported to the GUI, to be used as
+    a version stamp for entities that have no version column.
+
+    Entities that cannot be weak referenced have no change count.
+
+    .. attribute:: version
+
+        incremented each time changes are reported, :meth:`changed_since`
+        returns the ids of the entities changed after a version
+    """
+
+    # the number of reports for which the ids of the changed entities are kept
+    history = 100
+
+    def __init__(self):
+        self._changes = weakref.WeakKeyDictionary()
+        self._history = collections.deque(maxlen=self.history)
+        self.version = 0
+
+    def changed(self, entities):
+        """Increment the change count of entities"""
+        entities = tuple(entities)
+        for entity in entities:
+            try:
+                self._changes[entity] = self._changes.get(entity, 0) + 1
+            except TypeError:
+                pass
+        if entities:
+            self.version += 1
+            self._history.append((self.version, tuple(id(entity) for entity in entities)))
+
+    def changed_since(self, version):
+        """
+        :return: a list with the ids of the entities changed after a version,
+            `None` if the changes made since that version are no longer known.
+            The ids of entities that no longer exist might be reused by
+            other objects.
+        """
+        if version == self.version:
+            return []
+        if not self._history or self._history[0][0] > version + 1:
+            return None
+        return [entity_id for changed_version, entity_ids in self._history if changed_version > version for entity_id in entity_ids]
+
+    def get(self, entity):
+        """
+        :return: the number of changes of an entity, `None` if the changes of
+            the entity cannot be counted
+        """
+        try:
+            return self._changes.get(entity, 0)
+        except TypeError:
+            return None
+
+
+entity_changes = ChangeCounter()
+
+# Counts the changes of the field attributes of each admin, to be used as the
+# version of data derived from the field attributes.
+field_attributes_changes = ChangeCounter()
+
+
+def entity_version_stamp(entity):
+    """
+    :return: the version stamp of an entity, being the value of the version
+        column of its mapper, if any, together with its change count, or
+        `None` if the entity has no version stamp
+    """
+    change_count = entity_changes.get(entity)
+    if change_count is None:
+        return None
+    from sqlalchemy import orm
+    try:
+        mapper = orm.object_mapper(entity)
+    except orm.exc.UnmappedInstanceError:
+        return (None, change_count)
+    if mapper.version_id_col is None:
+        return (None, change_count)
+    version_property = mapper.get_property_by_column(mapper.version_id_col)
+    return (getattr(entity, version_property.key), change_count)
+
+
+class EntityRowIndex(object):
+    """
+    Process wide reverse index from the entities to the item caches in which
+    they are stored, and thus to the views and rows on which they are
+    displayed.
+
+    Item caches registered with the index keep it up to date as entities are
+    added to and removed from them, so the views and rows involved in a
+    change of an entity can be found without searching each open view.
+    """
+
+    def __init__(self):
+        self.caches_by_entity = collections.defaultdict(weakref.WeakSet)
+        self.owners = weakref.WeakKeyDictionary()
+
+    def __len__(self):
+        return len(self.caches_by_entity)
+
+    def register(self, cache, owner):
+        """
+        Register an item cache with the index
+
+        :param cache: the :class:`ValueCache` to register
+        :param owner: the object that owns the cache, such as the model
+            context of the view, only a weak reference to it is kept
+        """
+        self.owners[cache] = weakref.ref(owner)
+        for entity in cache.rows_by_entity:
+            self.caches_by_entity[entity].add(cache)
+        cache.index = self
+        # forget the entities of caches that were garbage collected
+        weakref.finalize(cache, self._purge)
+
+    def _purge(self):
+        for entity in [entity for entity, caches in self.caches_by_entity.items() if not caches]:
+            del self.caches_by_entity[entity]
+
+    def add(self, entity, cache):
+        self.caches_by_entity[entity].add(cache)
+
+    def discard(self, entity, cache):
+        caches = self.caches_by_entity.get(entity)
+        if caches is not None:
+            caches.discard(cache)
+            if not caches:
+                del self.caches_by_entity[entity]
+
+    def owner(self, cache):
+        """
+        :return: the owner of a registered cache, `None` if the cache is not
+            registered or its owner was garbage collected
+        """
+        owner_ref = self.owners.get(cache)
+        return owner_ref() if owner_ref is not None else None
+
+    def rows(self, entities):
+        """
+        :param entities: an iterable over entities
+        :return: a `dict` mapping the owner of each cache in which one of the
+            entities is stored to a sorted list of `(row, entity)` tuples
+        """
+        rows_by_owner = collections.defaultdict(list)
+        for entity in entities:
+            for cache in list(self.caches_by_entity.get(entity, ())):
+                row = cache.rows_by_entity.get(entity)
+                owner = self.owner(cache)
+                if row is not None and owner is not None:
+                    rows_by_owner[owner].append((row, entity))
+        for rows in rows_by_owner.values():
+            rows.sort(key=lambda row_entity: row_entity[0])
+        return dict(rows_by_owner)
+
+
+entity_rows = EntityRowIndex()
 
 
 class ValueCache(object):
@@ -37,23 +200,69 @@ class ValueCache(object):
     This cache is used to track which values have changed and for which
     an update of the gui is needed.
 
-    Fifo, is the actual cache containing a limited set of copies of row data
-    so the data in Fifo, is always immediately accessible to the gui thread,
-    with zero delay as you scroll down the table view, Fifo is filled and
-    refilled with data queried from the database
+    The cache contains a limited set of copies of row data
+    so the data in the cache, is always immediately accessible to the gui thread,
+    with zero delay as you scroll down the table view, the cache is filled and
+    refilled with data queried from the database.
+
+    When the cache is full, the least recently used rows are removed, where
+    both adding data to a row and retrieving the data of a row count as use.
     
     the cache can be queried either by the row number or by object represented 
     by the row data.
+
+    .. attribute:: hits
+
+        the number of retrievals of row data that was in the cache
+
+    .. attribute:: misses
+
+        the number of retrievals of row data that was not in the cache
+
+    .. attribute:: evictions
+
+        the number of rows removed to respect the limits of the cache
+
+    Row data can be added together with a version stamp of the entity, such
+    as the value of its version column.  As long as the stamp of an entity
+    remains the same, :meth:`unchanged` tells the row data is still valid, so
+    it does not need to be recomputed and compared with the cached data.
+
+    .. attribute:: index
+
+        the :class:`EntityRowIndex` in which the cache registers the entities
+        it stores, `None` if the cache is not indexed
+
+    .. attribute:: row_removed
+
+        a callable called with the row number each time a row is evicted or
+        deleted from the cache, or its entity moves to another row, `None`
+        if nothing needs to be called
+
+    Row data that was added without being sent to the view, for example
+    because it was prefetched, is marked with :meth:`mark_unsent`.  The next
+    time the row data of such an entity is added or found unchanged, all its
+    columns are reported as changed.
     """
-    def __init__(self, max_entries):
+
+    index = None
+    row_removed = None
+
+    def __init__(self, max_entries, max_bytes=None):
         """:param max_entries: the maximum entries that will be stored in the
-        cache, if more data is added, the oldest data gets removed"""
+        cache, if more data is added, the least recently used data gets removed
+        :param max_bytes: the maximum approximate number of bytes used by the
+        data in the cache, `None` if the size should not be limited
+        """
         self.max_entries = max_entries
-        self.data_by_rows = collections.defaultdict(dict)
-        self.rows_by_entity = collections.OrderedDict()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.clear()
     
     def __repr__(self):
-        return u'ValueCache({0.max_entries})'.format(self)
+        return u'ValueCache({0.max_entries}, {0.max_bytes})'.format(self)
     
     def __len__(self):
         """The number of rows in the cache"""
@@ -66,14 +275,31 @@ class ValueCache(object):
         """
         return self.data_by_rows.keys()
 
-    def add_data(self, row, entity, values):
+    @staticmethod
+    def sizeof(values):
+        """
+        :return: the approximate number of bytes used by the data of a row,
+            only the shallow size of each value is taken into account
+        """
+        return sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values.values())
+
+    def add_data(self, row, entity, values, stamp=None):
         """The entity might already be on another row, and this row
         might already contain an entity
-        
+
+        :param stamp: the version stamp of the entity from which the values
+            were computed, `None` if the entity has no version stamp
         :return: a :class:`set` with all the changed columns in the row
         
         """
-        old_value = self.delete_by_entity(entity)[1]
+        unsent = entity in self.unsent_entities
+        old_row, old_value = self._delete(entity)
+        if old_row is not None and old_row != row:
+            self._remove_row(old_row)
+        # the data of the entity previously on this row is no longer valid
+        previous_entity = self.entities_by_row.get(row)
+        if previous_entity is not None:
+            self._delete(previous_entity)
         if old_value is None:
             # there was no old data, so everything has changed
             changed_columns = set(values.keys())
@@ -82,31 +308,633 @@ class ValueCache(object):
             changed_columns = set(col for col, value in values.items() if value != old_value.get(col))
             new_values = old_value
             new_values.update(values)
+        if unsent:
+            changed_columns = set(new_values.keys())
+        size = self.sizeof(new_values)
         self.data_by_rows[row] = new_values
         self.rows_by_entity[entity] = row
-        if len(self.rows_by_entity)>self.max_entries:
-            entity, _row = self.rows_by_entity.popitem(last=False)
-            self.delete_by_entity(entity)
+        self.entities_by_row[row] = entity
+        if self.index is not None:
+            self.index.add(entity, self)
+        self.size_by_rows[row] = size
+        self.size += size
+        if stamp is not None:
+            self.stamps_by_entity[entity] = stamp
+        self._evict()
         return changed_columns
 
+    def add_page(self, page, stamps=None):
+        """Add the data of multiple rows at once
+
+        :param page: a list of `(row, entity, values)` tuples, as they would
+            be passed to :meth:`add_data`
+        :param stamps: a list with the version stamp of each entity in the
+            page, `None` if the entities have no version stamps
+        :return: a list with for each row in the page, the :class:`set` of
+            changed columns
+        """
+        if stamps is None:
+            stamps = itertools.repeat(None)
+        return [self.add_data(row, entity, values, stamp) for (row, entity, values), stamp in zip(page, stamps)]
+
+    def unchanged(self, row, entity, stamp):
+        """
+        Verify if the cached row data of an entity is still valid, because
+        its version stamp did not change since the row data was added.  If
+        the entity is cached on another row, the row data is moved to the
+        requested row.
+
+        :param stamp: the current version stamp of the entity, `None` if the
+            entity has no version stamp
+        :return: a :class:`set` with the changed columns in the row, `None` if
+            the row data should be computed and added with :meth:`add_data`
+        """
+        if stamp is None or self.stamps_by_entity.get(entity, _missing) != stamp:
+            return None
+        old_row = self.rows_by_entity[entity]
+        if old_row == row:
+            self.rows_by_entity.move_to_end(entity)
+            return self._take_unsent(row, entity, set())
+        _old_row, values = self._delete(entity)
+        self._remove_row(old_row)
+        return self.add_data(row, entity, values, stamp)
+
+    def mark_unsent(self, entity):
+        """Mark the row data of an entity as not sent to the view"""
+        if entity in self.rows_by_entity:
+            self.unsent_entities.add(entity)
+
+    def _take_unsent(self, row, entity, changed_columns):
+        """
+        :return: all the columns of the row, if the row data of the entity
+            was not sent to the view, otherwise the changed columns
+        """
+        if entity in self.unsent_entities:
+            self.unsent_entities.discard(entity)
+            return set(self._columns(row))
+        return changed_columns
+
+    def _columns(self, row):
+        """:return: the columns with data in a row"""
+        return self.data_by_rows[row].keys()
+
+    def _remove_row(self, row):
+        if self.row_removed is not None:
+            self.row_removed(row)
+
+    def _evict(self):
+        """Remove the least recently used rows until the limits of the cache
+        are respected, the most recently used row is always kept"""
+        while len(self.rows_by_entity) > 1 and (
+            (len(self.rows_by_entity) > self.max_entries) or
+            (self.max_bytes is not None and self.size > self.max_bytes)
+            ):
+            entity = next(iter(self.rows_by_entity))
+            self.delete_by_entity(entity)
+            self.evictions += 1
+
+    def resize(self, max_entries, max_bytes=None):
+        """Change the limits of the cache, removing the least recently used
+        rows if the cache no longer respects them"""
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self):
+        """Remove all data from the cache, while keeping its limits and
+        counters"""
+        self._unindex()
+        self.data_by_rows = collections.defaultdict(dict)
+        self.rows_by_entity = collections.OrderedDict()
+        self.entities_by_row = dict()
+        self.size_by_rows = dict()
+        self.stamps_by_entity = dict()
+        self.unsent_entities = set()
+        self.size = 0
+
+    def _unindex(self):
+        """Remove all entities of the cache from its index"""
+        if self.index is not None:
+            for entity in self.rows_by_entity:
+                self.index.discard(entity, self)
+
+    def invalidate(self, entities=None, columns=None):
+        """Remove the data of some entities and columns from the cache, so
+        only that data gets recomputed when the rows are requested again
+
+        :param entities: an iterable over the entities to invalidate, `None`
+            to invalidate all entities in the cache
+        :param columns: an iterable over the columns to invalidate, `None`
+            to invalidate all columns
+        :return: a sorted list of the rows that were invalidated
+        """
+        if entities is None:
+            entities = list(self.rows_by_entity.keys())
+        if columns is not None:
+            columns = set(columns)
+        rows = []
+        for entity in entities:
+            row = self.rows_by_entity.get(entity)
+            if row is None:
+                continue
+            if columns is None:
+                self.delete_by_entity(entity)
+            else:
+                self._discard_columns(row, entity, columns)
+                self.stamps_by_entity.pop(entity, None)
+            rows.append(row)
+        rows.sort()
+        return rows
+
+    def _discard_columns(self, row, entity, columns):
+        values = self.data_by_rows[row]
+        for column in columns:
+            values.pop(column, None)
+        size = self.sizeof(values)
+        self.size += size - self.size_by_rows[row]
+        self.size_by_rows[row] = size
+
     def get_data(self, row):
         """
         The return value of this function should not be changed.
 
         :return: a `dict` with the cached data in a row, the keys are the columns
         """
-        return self.data_by_rows.get(row, {})
+        entity = self.entities_by_row.get(row)
+        if entity is None:
+            self.misses += 1
+            return {}
+        self.hits += 1
+        self.rows_by_entity.move_to_end(entity)
+        return self.data_by_rows[row]
 
     def delete_by_entity(self, entity):
         """Remove everything in the cache related to an entity instance
         returns the row at which the data was stored if the data was in the
         cache, return None otherwise"""
+        row, value = self._delete(entity)
+        if row is not None:
+            self._remove_row(row)
+        return row, value
+
+    def _delete(self, entity):
         try:
-            row = self.rows_by_entity[entity]
-            value = self.data_by_rows.get(row, None)
-            del self.data_by_rows[row]
-            del self.rows_by_entity[entity]      
+            row = self.rows_by_entity.pop(entity)
         except KeyError:
             return None, None
+        value = self.data_by_rows.pop(row, None)
+        del self.entities_by_row[row]
+        self.stamps_by_entity.pop(entity, None)
+        self.unsent_entities.discard(entity)
+        if self.index is not None:
+            self.index.discard(entity, self)
+        self.size -= self.size_by_rows.pop(row)
         return row, value
 
+
+# Marks a slot in a column that contains no data.
+_missing = object()
+
+
+class ColumnarValueCache(ValueCache):
+    """
+    A :class:`ValueCache` that stores the row data column oriented.
+
+    Instead of a `dict` per row, the values of each column are kept in a
+    single list, in which each cached row occupies the same slot.  Slots of
+    removed rows are reused by newly added rows.  This avoids the overhead
+    of a `dict` per row for wide tables, and allows the changed columns of a
+    whole page to be determined column by column in :meth:`add_page`.
+
+    The row data returned by :meth:`get_data` is assembled from the columns
+    when requested.
+    """
+
+    def clear(self):
+        self._unindex()
+        self.columns = dict()
+        self.slots_by_row = dict()
+        self.size_by_slots = []
+        self.free_slots = []
+        self.rows_by_entity = collections.OrderedDict()
+        self.entities_by_row = dict()
+        self.stamps_by_entity = dict()
+        self.unsent_entities = set()
+        self.size = 0
+
+    def rows(self):
+        return self.slots_by_row.keys()
+
+    def _allocate_slot(self):
+        if self.free_slots:
+            return self.free_slots.pop()
+        for column_values in self.columns.values():
+            column_values.append(_missing)
+        self.size_by_slots.append(0)
+        return len(self.size_by_slots) - 1
+
+    def _release_slot(self, slot):
+        for column_values in self.columns.values():
+            column_values[slot] = _missing
+        self.size -= self.size_by_slots[slot]
+        self.size_by_slots[slot] = 0
+        self.free_slots.append(slot)
+
+    def _slot_data(self, slot):
+        data = dict()
+        for column, column_values in self.columns.items():
+            value = column_values[slot]
+            if value is not _missing:
+                data[column] = value
+        return data
+
+    def add_data(self, row, entity, values, stamp=None):
+        return self.add_page([(row, entity, values)], [stamp])[0]
+
+    def add_page(self, page, stamps=None):
+        slots = []
+        # the indexes in the page of the rows assigned to each slot
+        page_indexes_by_slot = collections.defaultdict(list)
+        for row, entity, _values in page:
+            # keep the slot of the entity, to compare the new values with
+            slot = None
+            old_row = self.rows_by_entity.pop(entity, None)
+            if old_row is not None:
+                del self.entities_by_row[old_row]
+                slot = self.slots_by_row.pop(old_row)
+                if old_row != row:
+                    self._remove_row(old_row)
+            # the data of the entity previously on this row is no longer valid
+            previous_entity = self.entities_by_row.get(row)
+            if previous_entity is not None:
+                # values of rows earlier in the page for the previous entity
+                # should no longer be stored
+                for page_index in page_indexes_by_slot.pop(self.slots_by_row[row], []):
+                    slots[page_index] = None
+                self._delete(previous_entity)
+            if slot is None:
+                slot = self._allocate_slot()
+            self.slots_by_row[row] = slot
+            self.rows_by_entity[entity] = row
+            self.entities_by_row[row] = entity
+            if self.index is not None:
+                self.index.add(entity, self)
+            page_indexes_by_slot[slot].append(len(slots))
+            slots.append(slot)
+        if stamps is not None:
+            for (_row, entity, _values), stamp in zip(page, stamps):
+                if stamp is not None and entity in self.rows_by_entity:
+                    self.stamps_by_entity[entity] = stamp
+        changed_columns = [set() for _slot in slots]
+        page_columns = set()
+        for _row, _entity, values in page:
+            page_columns.update(values.keys())
+        size_by_slots = self.size_by_slots
+        for column in page_columns:
+            column_values = self.columns.get(column)
+            if column_values is None:
+                column_values = self.columns[column] = [_missing] * len(size_by_slots)
+            for changed, slot, (_row, _entity, values) in zip(changed_columns, slots, page):
+                if slot is None:
+                    continue
+                value = values.get(column, _missing)
+                if value is _missing:
+                    continue
+                old_value = column_values[slot]
+                if old_value is _missing:
+                    changed.add(column)
+                    size = sys.getsizeof(value)
+                elif old_value != value:
+                    changed.add(column)
+                    size = sys.getsizeof(value) - sys.getsizeof(old_value)
+                else:
+                    continue
+                column_values[slot] = value
+                size_by_slots[slot] += size
+                self.size += size
+        if self.unsent_entities:
+            for i, (slot, (row, entity, _values)) in enumerate(zip(slots, page)):
+                if slot is not None:
+                    changed_columns[i] = self._take_unsent(row, entity, changed_columns[i])
+        self._evict()
+        return changed_columns
+
+    def _columns(self, row):
+        return self._slot_data(self.slots_by_row[row]).keys()
+
+    def _discard_columns(self, row, entity, columns):
+        slot = self.slots_by_row[row]
+        for column in columns:
+            column_values = self.columns.get(column)
+            if column_values is None or column_values[slot] is _missing:
+                continue
+            size = sys.getsizeof(column_values[slot])
+            column_values[slot] = _missing
+            self.size_by_slots[slot] -= size
+            self.size -= size
+
+    def get_data(self, row):
+        slot = self.slots_by_row.get(row)
+        if slot is None:
+            self.misses += 1
+            return {}
+        self.hits += 1
+        self.rows_by_entity.move_to_end(self.entities_by_row[row])
+        return self._slot_data(slot)
+
+    def _delete(self, entity):
+        try:
+            row = self.rows_by_entity.pop(entity)
+        except KeyError:
+            return None, None
+        del self.entities_by_row[row]
+        self.stamps_by_entity.pop(entity, None)
+        self.unsent_entities.discard(entity)
+        if self.index is not None:
+            self.index.discard(entity, self)
+        slot = self.slots_by_row.pop(row)
+        value = self._slot_data(slot)
+        self._release_slot(slot)
+        return row, value
+
+
+class _SharedEntry(object):
+    """The row data of an entity in the :class:`EntityValueCache`"""
+
+    __slots__ = ('values', 'version', 'history', 'dropped')
+
+    # versions are unique across entries, so a recreated entry never has
+    # a version already seen by a view
+    _versions = itertools.count(1)
+
+    def __init__(self):
+        self.values = dict()
+        self.version = 0
+        # the columns changed by the most recent versions
+        self.history = collections.deque(maxlen=EntityValueCache.history)
+        # the most recent version no longer in the history
+        self.dropped = 0
+
+    def update(self, changed_columns):
+        self.version = next(self._versions)
+        if len(self.history) == self.history.maxlen:
+            self.dropped = self.history[0][0]
+        self.history.append((self.version, changed_columns))
+
+    def changed_since(self, version):
+        """
+        :return: a :class:`set` with the columns changed after a version
+        """
+        if version is None or version < self.dropped:
+            return set(self.values.keys())
+        changed_columns = set()
+        for changed_version, columns in self.history:
+            if changed_version > version:
+                changed_columns.update(columns)
+        return changed_columns
+
+
+class EntityValueCache(object):
+    """
+    Process wide cache of the row data of entities, shared by all views that
+    display the same entity with the same admin.
+
+    The row data is stored by a key, being the admin used to display the
+    entity, and by the entity itself.  The version of an entry increases
+    each time its values change, so each view can determine which columns
+    changed since it last displayed the entity.
+
+    Views register the entities they display, so an update of an entity
+    invalidates its row data only once, and yields all views and rows
+    that display the entity.  Only weak references to the views are kept,
+    the entities of views that were garbage collected are forgotten.
+    """
+
+    # the number of versions for which the changed columns are kept
+    history = 8
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()
+        self.keys_by_entity = collections.defaultdict(set)
+        self.views_by_entity = collections.defaultdict(weakref.WeakSet)
+        self.views = weakref.WeakSet()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, entity):
+        """
+        :return: the `_SharedEntry` with the row data of the entity, `None`
+            if there is no row data for the entity
+        """
+        entry = self.entries.get((key, entity))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end((key, entity))
+        return entry
+
+    def update(self, key, entity, values):
+        """
+        Merge new values in the row data of an entity
+
+        :return: the `_SharedEntry` with the updated row data
+        """
+        entry = self.entries.get((key, entity))
+        if entry is None:
+            entry = self.entries[(key, entity)] = _SharedEntry()
+            self.keys_by_entity[entity].add(key)
+            changed_columns = set(values.keys())
+        else:
+            self.entries.move_to_end((key, entity))
+            changed_columns = set(col for col, value in values.items() if value != entry.values.get(col, _missing))
+        if changed_columns:
+            entry.values.update(values)
+            entry.update(changed_columns)
+        while len(self.entries) > self.max_entries:
+            (old_key, old_entity), _entry = self.entries.popitem(last=False)
+            self._discard_key(old_key, old_entity)
+            self.evictions += 1
+        return entry
+
+    def _discard_key(self, key, entity):
+        keys = self.keys_by_entity[entity]
+        keys.discard(key)
+        if not keys:
+            del self.keys_by_entity[entity]
+
+    def register(self, entity, view):
+        """Register a view that displays an entity"""
+        self.views_by_entity[entity].add(view)
+        if view not in self.views:
+            self.views.add(view)
+            # forget the entities of the view when it is garbage collected
+            weakref.finalize(view, self._purge)
+
+    def _purge(self):
+        # the weak reference to the collected view might not yet be removed
+        # from the sets, so only the live views are counted
+        for entity in [entity for entity, views in self.views_by_entity.items() if not list(views)]:
+            del self.views_by_entity[entity]
+
+    def unregister(self, entity, view):
+        """Unregister a view that no longer displays an entity"""
+        views = self.views_by_entity.get(entity)
+        if views is not None:
+            views.discard(view)
+            if not views:
+                del self.views_by_entity[entity]
+
+    def invalidate(self, entities):
+        """
+        Remove the row data of entities that have been changed or deleted,
+        so it is recomputed once when it is needed again.
+
+        :param entities: an iterable over the changed entities
+        :return: a `dict` mapping each view that displays one of the entities
+            to a list of the rows on which they are displayed
+        """
+        rows_by_view = collections.defaultdict(list)
+        for entity in entities:
+            for key in self.keys_by_entity.pop(entity, ()):
+                del self.entries[(key, entity)]
+            for view in list(self.views_by_entity.get(entity, ())):
+                row = view.rows_by_entity.get(entity)
+                if row is not None:
+                    view.versions_by_entity.pop(entity, None)
+                    rows_by_view[view].append(row)
+        return rows_by_view
+
+
+entity_value_cache = EntityValueCache()
+
+
+class SharedValueCache(ValueCache):
+    """
+    A :class:`ValueCache` that only keeps track of which entity is displayed
+    on which row of a view, while the row data itself is stored in the
+    process wide :class:`EntityValueCache`, so the row data of an entity
+    displayed in multiple views is computed and stored only once.
+
+    :param key: the key under which the row data is shared, being the admin
+        used to display the entities
+    :param store: the :class:`EntityValueCache` in which row data is stored
+    """
+
+    def __init__(self, max_entries, max_bytes=None, key=None, store=None):
+        self.key = key
+        self.store = store if store is not None else entity_value_cache
+        self.rows_by_entity = collections.OrderedDict()
+        super().__init__(max_entries, max_bytes)
+
+    def __repr__(self):
+        return u'SharedValueCache({0.max_entries}, {0.max_bytes}, {0.key})'.format(self)
+
+    def clear(self):
+        self._unindex()
+        for entity in self.rows_by_entity:
+            self.store.unregister(entity, self)
+        self.rows_by_entity = collections.OrderedDict()
+        self.entities_by_row = dict()
+        self.versions_by_entity = dict()
+        self.stamps_by_entity = dict()
+        self.unsent_entities = set()
+        self.size = 0
+
+    def rows(self):
+        return self.entities_by_row.keys()
+
+    def _display(self, row, entity, entry):
+        """Display an entity on a row of the view
+        
+        :return: a :class:`set` with the columns changed since the view last
+            displayed the entity
+        """
+        old_row = self.rows_by_entity.pop(entity, None)
+        if old_row is not None:
+            del self.entities_by_row[old_row]
+            if old_row != row:
+                self._remove_row(old_row)
+        # the entity previously on this row is no longer displayed
+        previous_entity = self.entities_by_row.get(row)
+        if previous_entity is not None:
+            self._delete(previous_entity)
+        self.rows_by_entity[entity] = row
+        self.entities_by_row[row] = entity
+        self.store.register(entity, self)
+        if self.index is not None:
+            self.index.add(entity, self)
+        changed_columns = entry.changed_since(self.versions_by_entity.get(entity))
+        self.versions_by_entity[entity] = entry.version
+        changed_columns = self._take_unsent(row, entity, changed_columns)
+        self._evict()
+        return changed_columns
+
+    def lookup(self, row, entity):
+        """
+        Display an entity on a row, when its row data is available in the
+        shared cache, so the row data does not need to be computed.
+
+        :return: a :class:`set` with the columns changed since the view last
+            displayed the entity, `None` if the row data should be computed
+            and added with :meth:`add_data`
+        """
+        entry = self.store.get(self.key, entity)
+        if entry is None:
+            return None
+        return self._display(row, entity, entry)
+
+    def add_data(self, row, entity, values, stamp=None):
+        entry = self.store.update(self.key, entity, values)
+        changed_columns = self._display(row, entity, entry)
+        if stamp is not None:
+            self.stamps_by_entity[entity] = stamp
+        return changed_columns
+
+    def unchanged(self, row, entity, stamp):
+        # the shared row data might have been invalidated or evicted
+        if entity not in self.versions_by_entity or (self.key, entity) not in self.store.entries:
+            return None
+        return super().unchanged(row, entity, stamp)
+
+    def _columns(self, row):
+        entry = self.store.entries.get((self.key, self.entities_by_row[row]))
+        return entry.values.keys() if entry is not None else ()
+
+    def _discard_columns(self, row, entity, columns):
+        # the columns are recomputed as changed by the next update of the
+        # entry, so other views displaying the entity get their new values
+        entry = self.store.entries.get((self.key, entity))
+        if entry is not None:
+            for column in columns:
+                entry.values.pop(column, None)
+
+    def get_data(self, row):
+        entity = self.entities_by_row.get(row)
+        entry = self.store.get(self.key, entity) if entity is not None else None
+        if entry is None:
+            self.misses += 1
+            return {}
+        self.hits += 1
+        self.rows_by_entity.move_to_end(entity)
+        return entry.values
+
+    def _delete(self, entity):
+        try:
+            row = self.rows_by_entity.pop(entity)
+        except KeyError:
+            return None, None
+        del self.entities_by_row[row]
+        self.versions_by_entity.pop(entity, None)
+        self.stamps_by_entity.pop(entity, None)
+        self.unsent_entities.discard(entity)
+        self.store.unregister(entity, self)
+        if self.index is not None:
+            self.index.discard(entity, self)
+        entry = self.store.entries.get((self.key, entity))
+        return row, (entry.values if entry is not None else None)
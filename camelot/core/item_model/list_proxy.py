@@ -0,0 +1,479 @@
+#  ============================================================================
+#
+#  Copyright (C) 2007-2016 Conceptive Engineering bvba.
+#  www.conceptive.be / info@conceptive.be
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#      * Redistributions of source code must retain the above copyright
+#        notice, this list of conditions and the following disclaimer.
+#      * Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#      * Neither the name of Conceptive Engineering nor the
+#        names of its contributors may be used to endorse or promote products
+#        derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+#  ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+#  WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL <COPYRIGHT HOLDER> BE LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#  (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+#  LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+#  ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#  ============================================================================
+
+"""
+Model proxy for pure python lists.
+"""
+
+import collections
+import itertools
+import locale
+
+from ..cache import entity_changes
+from .proxy import AbstractModelProxy, sort_order
+
+# Marks a slot of an object that was removed from the proxy.
+_removed = object()
+
+
+class _Slots(object):
+    """
+    Objects in slots, with a Fenwick tree counting the objects before each
+    slot.  Removing an object leaves an empty slot, appended objects get a
+    new slot at the end.
+    """
+
+    def __init__(self, objects):
+        self.objects = objects
+        # when an object is in the list multiple times, its first slot is used
+        self.slot_by_id = dict(zip(map(id, reversed(objects)), range(len(objects) - 1, -1, -1)))
+        self.length = len(objects)
+        # the Fenwick tree, with for each slot 1 if it contains an object,
+        # tree[i] holds the number of objects in slots i - (i & -i) up to i - 1,
+        # which is i & -i as long as all slots contain an object
+        self.tree = [i & -i for i in range(len(objects) + 1)]
+
+    def copy(self):
+        new_slots = self.__class__.__new__(self.__class__)
+        new_slots.objects = list(self.objects)
+        new_slots.slot_by_id = dict(self.slot_by_id)
+        new_slots.length = self.length
+        new_slots.tree = list(self.tree)
+        return new_slots
+
+    def count_before(self, slot):
+        """:return: the number of objects in the slots before a slot"""
+        count = 0
+        tree = self.tree
+        while slot > 0:
+            count += tree[slot]
+            slot -= slot & -slot
+        return count
+
+    def find_slot(self, index):
+        """:return: the slot holding the object at an index"""
+        tree = self.tree
+        slot = 0
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            next_slot = slot + step
+            if next_slot < len(tree) and tree[next_slot] <= index:
+                slot = next_slot
+                index -= tree[next_slot]
+            step >>= 1
+        return slot
+
+    def live_objects(self):
+        return [obj for obj in self.objects if obj is not _removed]
+
+    def get(self, start, stop):
+        """:return: a list with the objects from index start up to stop"""
+        objects = []
+        slots = self.objects
+        slot = self.find_slot(start)
+        while len(objects) < stop - start:
+            obj = slots[slot]
+            if obj is not _removed:
+                objects.append(obj)
+            slot += 1
+        return objects
+
+    def append(self, obj):
+        slot = len(self.objects)
+        self.objects.append(obj)
+        self.slot_by_id[id(obj)] = slot
+        self.length += 1
+        # the new node counts the objects in the slots it covers
+        i = slot + 1
+        lowest = i - (i & -i)
+        self.tree.append(1 + self.count_before(slot) - self.count_before(lowest))
+
+    def remove(self, obj):
+        """:return: `True` if the object was in a slot"""
+        slot = self.slot_by_id.pop(id(obj), None)
+        if slot is None:
+            return False
+        self.objects[slot] = _removed
+        self.length -= 1
+        i = slot + 1
+        tree = self.tree
+        while i < len(tree):
+            tree[i] -= 1
+            i += i & -i
+        return True
+
+    def sparse(self):
+        """:return: `True` if more than half of the slots are empty"""
+        return len(self.objects) > 2 * self.length + 32
+
+
+class _Model(object):
+    """
+    The list of objects that is the model of a proxy and its copies, of
+    which the objects are counted by identity, so the list is only scanned
+    when an object in it is removed.
+    """
+
+    def __init__(self, objects):
+        self.objects = objects
+        # the number of times each object is in the list, by id, counted
+        # when first needed
+        self.counts = None
+        # the length of the list, to notice changes made outside the model
+        self.length = len(objects)
+
+    def _count(self):
+        if (self.counts is None) or (len(self.objects) != self.length):
+            self.counts = collections.Counter(map(id, self.objects))
+            self.length = len(self.objects)
+        return self.counts
+
+    def __contains__(self, obj):
+        return self._count().get(id(obj), 0) > 0
+
+    def append(self, obj):
+        counts = self._count()
+        self.objects.append(obj)
+        counts[id(obj)] += 1
+        self.length += 1
+
+    def remove(self, obj):
+        """Remove the first occurrence of an object from the list, as
+        list.remove would, but comparing by identity"""
+        counts = self._count()
+        obj_id = id(obj)
+        if not counts.get(obj_id):
+            return
+        objects = self.objects
+        # list.index finds the object itself, unless an object before it
+        # compares equal
+        i = objects.index(obj)
+        while objects[i] is not obj:
+            i += 1
+        del objects[i]
+        counts[obj_id] -= 1
+        if not counts[obj_id]:
+            del counts[obj_id]
+        self.length -= 1
+
+
+class ListModelProxy(AbstractModelProxy):
+    """
+    A model proxy for a python list of objects.
+
+    The objects of the proxy, after sorting and filtering, are stored in
+    slots.  Removing an object leaves an empty slot, and appended objects
+    get a new slot at the end, so the slots of the other objects remain the
+    same.  A Fenwick tree over the slots counts the objects before each
+    slot, while a `dict` maps each object to its slot.  This makes
+    :meth:`append`, :meth:`remove` and :meth:`index` O(log n) for the
+    proxy, whatever its sort order.  The slots are compacted once more
+    than half of them are empty.  Objects appended while the slots are read
+    backwards get slots in a separate tail, displayed after the other
+    objects.
+
+    Objects are indexed by identity, so they need not be hashable.
+
+    Appended objects are displayed at the end of the proxy, until it is
+    sorted again.  Sorting starts from the current order of the objects,
+    so when only a few objects were appended or changed since the previous
+    sort, the objects are merged in place instead of sorted from scratch.
+
+    The sort key of each object is computed once per attribute and cached,
+    strings are sorted by their locale collation key.  Cached sort keys of
+    objects reported as changed through
+    :data:`camelot.core.cache.entity_changes` are recomputed.
+
+    When `reverse_by_reading_backwards` is set, sorting in the opposite
+    direction of the current sort only reverses the direction in which the
+    slots are read, as long as no objects were appended or changed since
+    the current sort.  Objects with equal sort keys are then in the
+    opposite order as well, instead of in the order a new sort would put
+    them, so this is not done by default.
+
+    Sorting and filtering can be done in steps with :meth:`sort_job` and
+    :meth:`filter_job`, the order of the proxy only changes after the last
+    step.
+
+    Copies of the proxy share their slots until one of them is sorted,
+    filtered, or has objects appended or removed, so copying is O(1).
+
+    :param objects: the list of objects that is the model of the proxy
+    """
+
+    # answer a sort in the opposite direction of the current sort by reading
+    # the current order backwards, which reverses the order of equal objects
+    reverse_by_reading_backwards = False
+    # the function computing the collation key of strings
+    collation_key = staticmethod(locale.strxfrm)
+    # the number of objects handled in each step of a sort or filter job
+    job_chunk_size = 10000
+
+    def __init__(self, objects):
+        assert isinstance(objects, list)
+        self._model = _Model(objects)
+        self._sort_order = tuple()
+        # the slots are read backwards
+        self._reversed = False
+        self._appended_since_sort = False
+        # for each sort attribute, a dict mapping the id of an object to the
+        # object and its sort key
+        self._sort_keys = dict()
+        self._changes_version = entity_changes.version
+        self._filters = collections.OrderedDict()
+        self._build(list(objects))
+
+    def _build(self, objects):
+        """Assign each object of the proxy to a slot, in display order"""
+        self._shared = False
+        self._slots = _Slots(objects)
+        # the slots of objects appended while the slots are read backwards
+        self._tail = _Slots([])
+
+    def _unshare(self):
+        """Copy the slots shared with other copies of the proxy, before
+        they are modified"""
+        if self._shared:
+            self._slots = self._slots.copy()
+            self._tail = self._tail.copy()
+            self._shared = False
+
+    def _contains(self, obj):
+        return (id(obj) in self._slots.slot_by_id) or (id(obj) in self._tail.slot_by_id)
+
+    def _display_objects(self):
+        objects = self._slots.live_objects()
+        if self._reversed:
+            objects.reverse()
+        objects.extend(self._tail.live_objects())
+        return objects
+
+    def _sort_values(self, attribute, objects):
+        """:return: a list with the cached sort key of each object for an
+        attribute"""
+        keys = self._sort_keys.setdefault(attribute, dict())
+        collation_key = self.collation_key
+        values = []
+        for obj, entry in zip(objects, map(keys.get, map(id, objects))):
+            if (entry is None) or (entry[0] is not obj):
+                value = getattr(obj, attribute)
+                if isinstance(value, str):
+                    value = collation_key(value)
+                entry = keys[id(obj)] = (obj, value)
+            values.append(entry[1])
+        return values
+
+    def _sync_sort_keys(self):
+        """Forget the cached sort keys of objects that changed
+
+        :return: `True` if objects in the proxy might have changed
+        """
+        changed = entity_changes.changed_since(self._changes_version)
+        self._changes_version = entity_changes.version
+        if changed is None:
+            self._sort_keys.clear()
+            return True
+        changed_in_proxy = False
+        for obj_id in changed:
+            for keys in self._sort_keys.values():
+                keys.pop(obj_id, None)
+            if (obj_id in self._slots.slot_by_id) or (obj_id in self._tail.slot_by_id):
+                changed_in_proxy = True
+        return changed_in_proxy
+
+    def _sorted(self, objects, order):
+        """Sort a list of objects, from the least significant sort attribute
+        to the most significant, objects for which an attribute is `None`
+        are sorted before the other objects.
+
+        This is a generator yielding after each chunk of sort keys, that
+        returns the sorted objects.
+        """
+        chunk_size = self.job_chunk_size
+        for attribute, descending in reversed(order):
+            values = []
+            for start in range(0, len(objects), chunk_size):
+                values.extend(self._sort_values(attribute, objects[start:start+chunk_size]))
+                yield
+            present = [i for i, value in enumerate(values) if value is not None]
+            absent = [i for i, value in enumerate(values) if value is None]
+            present.sort(key=values.__getitem__, reverse=descending)
+            indexes = (present + absent) if descending else (absent + present)
+            objects = [objects[i] for i in indexes]
+        return objects
+
+    def __len__(self):
+        return self._slots.length + self._tail.length
+
+    def copy(self):
+        new_proxy = self.__class__.__new__(self.__class__)
+        new_proxy._model = self._model
+        new_proxy.mutation_count = self.mutation_count
+        new_proxy._sort_order = self._sort_order
+        new_proxy._reversed = self._reversed
+        new_proxy._appended_since_sort = self._appended_since_sort
+        new_proxy._sort_keys = self._sort_keys
+        new_proxy._changes_version = self._changes_version
+        new_proxy._filters = self._filters
+        new_proxy._slots = self._slots
+        new_proxy._tail = self._tail
+        new_proxy._shared = self._shared = True
+        return new_proxy
+
+    def _filtered_objects(self, filters):
+        """Apply filters on the model.
+
+        This is a generator yielding after each chunk of filtered objects,
+        that returns the filtered objects.
+        """
+        iterator = iter(self._model.objects)
+        for model_filter, value in filters.items():
+            iterator = model_filter.filter(iterator, value)
+        objects = []
+        while True:
+            chunk = list(itertools.islice(iterator, self.job_chunk_size))
+            objects.extend(chunk)
+            if len(chunk) < self.job_chunk_size:
+                return objects
+            yield
+
+    def sort(self, key=None, reverse=False):
+        for _step in self.sort_job(key, reverse):
+            pass
+
+    def sort_job(self, key=None, reverse=False):
+        order = sort_order(key, reverse)
+        changed = self._sync_sort_keys() or self._appended_since_sort
+        opposite_order = tuple((attribute, not descending) for attribute, descending in self._sort_order)
+        if order and (not changed) and (order == self._sort_order):
+            pass
+        elif order and (not changed) and (order == opposite_order) and self.reverse_by_reading_backwards:
+            self._reversed = not self._reversed
+        elif order:
+            # the current order is kept as the starting point, the objects
+            # already sorted form a single run, with which the appended or
+            # changed objects are merged
+            objects = yield from self._sorted(self._display_objects(), order)
+            self._build(objects)
+            self._reversed = False
+        else:
+            objects = yield from self._filtered_objects(self._filters)
+            self._build(objects)
+            self._reversed = (reverse is True)
+        self._sort_order = order
+        self._appended_since_sort = False
+        self.mutation_count += 1
+
+    def filter(self, key, value):
+        for _step in self.filter_job(key, value):
+            pass
+
+    def filter_job(self, key, value):
+        filters = collections.OrderedDict(self._filters)
+        if value is None:
+            filters.pop(key, None)
+        else:
+            filters[key] = value
+        objects = yield from self._filtered_objects(filters)
+        if self._sort_order:
+            self._sync_sort_keys()
+            objects = yield from self._sorted(objects, self._sort_order)
+        elif self._reversed:
+            objects.reverse()
+        self._filters = filters
+        self._build(objects)
+        self._reversed = False
+        self._appended_since_sort = False
+        self.mutation_count += 1
+
+    def get_filter(self, key):
+        return self._filters.get(key)
+
+    def get_model(self):
+        return self._model.objects
+
+    def append(self, obj):
+        if self._contains(obj):
+            return
+        # without filters, the objects in the proxy are those in the model,
+        # otherwise the object might be in the model but filtered out
+        if not (self._filters and (obj in self._model)):
+            self._model.append(obj)
+        self._unshare()
+        self._appended_since_sort = True
+        self.mutation_count += 1
+        # appended objects are displayed at the end
+        if self._reversed:
+            self._tail.append(obj)
+        else:
+            self._slots.append(obj)
+
+    def remove(self, obj):
+        if self._contains(obj):
+            self._unshare()
+            if not self._slots.remove(obj):
+                self._tail.remove(obj)
+            if self._slots.sparse():
+                self._slots = _Slots(self._slots.live_objects())
+            if self._tail.sparse():
+                self._tail = _Slots(self._tail.live_objects())
+            for keys in self._sort_keys.values():
+                keys.pop(id(obj), None)
+            self.mutation_count += 1
+        self._model.remove(obj)
+
+    def index(self, obj):
+        slots = self._slots
+        slot = slots.slot_by_id.get(id(obj))
+        if slot is not None:
+            position = slots.count_before(slot)
+            if self._reversed:
+                return slots.length - 1 - position
+            return position
+        slot = self._tail.slot_by_id.get(id(obj))
+        if slot is None:
+            raise ValueError('{} is not in the proxy'.format(obj))
+        return slots.length + self._tail.count_before(slot)
+
+    def __getitem__(self, sl, yield_per=None):
+        start = sl.start or 0
+        stop = len(self) if sl.stop is None else min(sl.stop, len(self))
+        if start < 0 or (sl.stop is not None and sl.stop < 0):
+            raise IndexError('Slice indexes should be positive')
+        objects = []
+        length = self._slots.length
+        if start < min(stop, length):
+            if self._reversed:
+                objects = self._slots.get(length - min(stop, length), length - start)
+                objects.reverse()
+            else:
+                objects = self._slots.get(start, min(stop, length))
+        if stop > length:
+            objects.extend(self._tail.get(max(start, length) - length, stop - length))
+        return iter(objects)
@@ -64,14 +64,50 @@ class AbstractModelFilter(ABC):
         :return: a filtered iterator
         """
 
+def sort_order(key, reverse=False):
+    """
+    :param key: the `key` argument of :meth:`AbstractModelProxy.sort`
+    :param reverse: the `reverse` argument of :meth:`AbstractModelProxy.sort`
+    :return: a tuple of `(attribute, descending)` tuples with the order
+        specified by the arguments, an empty tuple if no order is specified
+    """
+    if key is None:
+        return tuple()
+    if isinstance(key, str):
+        key = (key,)
+    if isinstance(reverse, bool):
+        reverse = (reverse,) * len(key)
+    if len(reverse) != len(key):
+        raise ValueError('{} sort attributes with {} sort directions'.format(len(key), len(reverse)))
+    return tuple(zip(key, reverse))
+
 class AbstractModelProxy(ABC):
 
+    # incremented each time the objects in the proxy or their order might
+    # have changed, because the proxy was sorted or filtered, or objects
+    # were appended or removed
+    mutation_count = 0
+
     @abstractmethod
     def __len__(self):
         """
         :return: the number of objects that can be retrieved from the proxy
         """
 
+    def length_is_exact(self):
+        """
+        :return: `False` if the length of the proxy is an estimate, in which
+            case the exact length can be requested with :meth:`exact_length`
+        """
+        return True
+
+    def exact_length(self):
+        """
+        :return: the exact number of objects that can be retrieved from the
+            proxy, this might take considerably longer than :meth:`__len__`
+        """
+        return len(self)
+
     @abstractmethod
     def copy(self):
         """
@@ -85,9 +121,32 @@ class AbstractModelProxy(ABC):
         Apply an order on the objects retrieved by the proxy.  This order is not
         applied on the model itself.
 
-        :key: the name of the attribute to sort the objects on, use None to
-            disable a previous sort.
+        :key: the name of the attribute to sort the objects on, or a tuple
+            with the names of multiple attributes, use None to disable a
+            previous sort.
+        :reverse: `True` to sort in descending order, or a tuple with for
+            each attribute whether its order is descending.
+        """
+
+    def sort_job(self, key=None, reverse=False):
+        """
+        Sort the proxy in steps, as with :meth:`sort`.
+
+        :return: a generator that yields after each step, the order of the
+            proxy only changes after the last step.
+        """
+        self.sort(key, reverse)
+        yield
+
+    def filter_job(self, key, value):
+        """
+        Filter the proxy in steps, as with :meth:`filter`.
+
+        :return: a generator that yields after each step, the objects in the
+            proxy only change after the last step.
         """
+        self.filter(key, value)
+        yield
 
     @abstractmethod
     def filter(self, key, value):
@@ -0,0 +1,389 @@
+#  ============================================================================
+#
+#  Copyright (C) 2007-2016 Conceptive Engineering bvba.
+#  www.conceptive.be / info@conceptive.be
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#      * Redistributions of source code must retain the above copyright
+#        notice, this list of conditions and the following disclaimer.
+#      * Redistributions in binary form must reproduce the above copyright
+#        notice, this list of conditions and the following disclaimer in the
+#        documentation and/or other materials provided with the distribution.
+#      * Neither the name of Conceptive Engineering nor the
+#        names of its contributors may be used to endorse or promote products
+#        derived from this software without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+#  ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+#  WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+#  DISCLAIMED. IN NO EVENT SHALL <COPYRIGHT HOLDER> BE LIABLE FOR ANY
+#  DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+#  (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+#  LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+#  ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+#  (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+#  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+#  ============================================================================
+
+"""
+Model proxy for sqlalchemy queries.
+"""
+
+import bisect
+import collections
+import time
+
+from sqlalchemy import and_, inspect, or_, orm, sql
+
+from .proxy import AbstractModelProxy, sort_order
+
+
+class QueryModelProxy(AbstractModelProxy):
+    """
+    A model proxy for a sqlalchemy query over a single mapped entity.
+
+    The objects of the proxy are the objects returned by the query, followed
+    by the objects appended to the proxy.  Objects removed from the proxy
+    are excluded from the query by their primary key.  Objects retrieved
+    from the query are kept at their index until the proxy is sorted or
+    filtered, or objects are appended or removed.
+
+    Pages deep into the query are fetched by keyset pagination : for each
+    page fetched, the sort key of its last object is remembered, and a page
+    starting at such a boundary is fetched by selecting the objects with a
+    larger sort key, instead of skipping all previous objects with an
+    `OFFSET`.  Pages not starting at a known boundary are fetched with an
+    offset relative to the nearest boundary before them.
+
+    Keyset pagination is used when the order of the proxy is known, being
+    the sort attributes followed by the primary key, and none of the
+    columns involved can be `NULL`.  Otherwise pages are fetched with an
+    `OFFSET` relative to the start of the query.
+
+    When :attr:`exact_count_limit` is set, at most that many objects are
+    counted to determine the length of the proxy.  If the query returns more
+    objects, the length is estimated, and the exact length is only counted
+    when :meth:`exact_length` is called, for example when the model thread
+    is idle.  Sorting keeps the length of the proxy.
+
+    Copies of the proxy share the objects retrieved and the known page
+    boundaries, until one of them is sorted, filtered, or has objects
+    appended or removed, so copying is O(1).
+
+    When objects are requested with a `yield_per` hint, they are fetched
+    in batches as they are iterated, and are not kept by the proxy, so
+    iterating over a large query does not increase memory usage.  The first
+    batch has `yield_per` objects, the size of the next batches is adapted
+    so a batch takes about :attr:`fetch_time` seconds to fetch.
+
+    :param query: a :class:`sqlalchemy.orm.Query` over a mapped entity
+    """
+
+    # the number of objects above which the length of the query is estimated
+    # instead of counted exactly, `None` to always count exactly
+    exact_count_limit = None
+    # the number of seconds fetching a batch of objects should take
+    fetch_time = 0.1
+    # the limits of the number of objects fetched in a batch
+    min_batch_size = 10
+    max_batch_size = 10000
+
+    def __init__(self, query):
+        self._query = query
+        self._mapper = inspect(query.column_descriptions[0]['entity'])
+        self._sort_order = tuple()
+        # the primary key orders objects with the same sort attributes
+        self._primary_key_descending = False
+        self._filters = collections.OrderedDict()
+        self._appended = []
+        self._removed = []
+        self._batch_size = None
+        self._reset()
+
+    def _reset(self, length=True):
+        """Forget the objects retrieved, after the content or the order of
+        the proxy changed
+
+        :param length: `False` if the length of the proxy did not change
+        """
+        self.mutation_count += 1
+        if length:
+            self._length = None
+            self._estimated_length = None
+        self._objects_by_index = dict()
+        self._indexes_by_id = dict()
+        # the indexes at which a page boundary is known, and for each of
+        # them the sort key of the object before the boundary
+        self._boundaries = [0]
+        self._keys_by_boundary = {0: None}
+
+    def _order_columns(self):
+        """
+        :return: a list of `(column, descending)` tuples with the order of the
+            objects in the query, `None` if this order cannot be used for
+            keyset pagination
+        """
+        order_columns = []
+        for attribute, descending in self._sort_order:
+            sort_property = self._mapper.attrs.get(attribute)
+            if not isinstance(sort_property, orm.ColumnProperty):
+                return None
+            order_columns.extend((column, descending) for column in sort_property.columns)
+        if (not self._sort_order) and getattr(self._query, '_order_by_clauses', ()):
+            # the order of the query itself is unknown
+            return None
+        order_columns.extend((column, self._primary_key_descending) for column in self._mapper.primary_key)
+        for column, _descending in order_columns:
+            if not isinstance(column, sql.schema.Column) or column.nullable:
+                return None
+        return order_columns
+
+    def _sort_key(self, order_columns, obj):
+        """:return: the values of the order columns of an object"""
+        key = []
+        for column, _descending in order_columns:
+            value = getattr(obj, self._mapper.get_property_by_column(column).key)
+            if value is None:
+                return None
+            key.append(value)
+        return tuple(key)
+
+    def _excluded_objects(self):
+        """:return: the persistent objects that should not be retrieved from
+        the query, since they were removed or appended"""
+        for obj in self._removed + self._appended:
+            state = inspect(obj)
+            if state.key is not None:
+                yield state.key[1]
+
+    def _get_query(self):
+        """:return: the query with the filters, exclusions and order of the
+            proxy applied"""
+        query = self._query
+        for model_filter, value in self._filters.items():
+            query = model_filter.filter(query, value)
+        primary_key = self._mapper.primary_key
+        excluded = list(self._excluded_objects())
+        if excluded:
+            if len(primary_key) == 1:
+                query = query.filter(~primary_key[0].in_([identity[0] for identity in excluded]))
+            else:
+                query = query.filter(~sql.tuple_(*primary_key).in_(excluded))
+        if self._sort_order:
+            query = query.order_by(None)
+            for attribute, descending in self._sort_order:
+                sort_attribute = getattr(self._mapper.class_, attribute)
+                query = query.order_by(sort_attribute.desc() if descending else sort_attribute.asc())
+        for column in primary_key:
+            query = query.order_by(column.desc() if self._primary_key_descending else column.asc())
+        return query
+
+    def _query_length(self):
+        """:return: the number of objects returned by the query, or an
+        estimate if the number is not known yet"""
+        if self._length is not None:
+            return self._length
+        if self._estimated_length is not None:
+            return self._estimated_length
+        query = self._get_query().order_by(None)
+        if self.exact_count_limit is None:
+            self._length = query.count()
+            return self._length
+        counted = query.limit(self.exact_count_limit + 1).count()
+        if counted <= self.exact_count_limit:
+            self._length = counted
+            return self._length
+        self._estimated_length = max(counted, self.estimate_length(query))
+        return self._estimated_length
+
+    def estimate_length(self, query):
+        """
+        Estimate the number of objects returned by a query, without counting
+        them.  This implementation uses the planner statistics of PostgreSQL,
+        reimplement this method for other databases.
+
+        :return: the estimated number of objects, 0 if no estimate is
+            available
+        """
+        connection = query.session.connection()
+        if connection.dialect.name != 'postgresql':
+            return 0
+        # expanding parameters, such as the objects excluded with an IN
+        # clause, are rendered as individual parameters
+        compiled = query.statement.compile(
+            dialect=connection.dialect, compile_kwargs={'render_postcompile': True}
+        )
+        plan = connection.exec_driver_sql(
+            'EXPLAIN (FORMAT JSON) ' + str(compiled), compiled.params
+        ).scalar()
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def __len__(self):
+        return self._query_length() + len(self._appended)
+
+    def length_is_exact(self):
+        self._query_length()
+        return self._length is not None
+
+    def exact_length(self):
+        if self._length is None:
+            self._length = self._get_query().order_by(None).count()
+            self._estimated_length = None
+        return self._length + len(self._appended)
+
+    def copy(self):
+        # as long as both proxies have the same content and order, objects
+        # retrieved by one of them are at the same index in the other, the
+        # containers are replaced instead of modified when this changes
+        new_proxy = self.__class__.__new__(self.__class__)
+        new_proxy.__dict__.update(self.__dict__)
+        return new_proxy
+
+    def sort(self, key=None, reverse=False):
+        self._sort_order = sort_order(key, reverse)
+        if self._sort_order:
+            self._primary_key_descending = self._sort_order[0][1]
+        else:
+            self._primary_key_descending = (reverse is True)
+        self._reset(length=False)
+
+    def filter(self, key, value):
+        self._filters = collections.OrderedDict(self._filters)
+        if value is None:
+            self._filters.pop(key, None)
+        else:
+            self._filters[key] = value
+        self._reset()
+
+    def get_filter(self, key):
+        return self._filters.get(key)
+
+    def get_model(self):
+        return self._query
+
+    def append(self, obj):
+        if obj not in self._appended:
+            self._appended = self._appended + [obj]
+            self._removed = [removed for removed in self._removed if removed is not obj]
+            self._reset()
+
+    def remove(self, obj):
+        self._appended = [appended for appended in self._appended if appended is not obj]
+        if obj not in self._removed:
+            self._removed = self._removed + [obj]
+        self._reset()
+
+    def index(self, obj):
+        try:
+            return self._indexes_by_id[id(obj)]
+        except KeyError:
+            pass
+        if obj in self._appended:
+            return self._query_length() + self._appended.index(obj)
+        raise ValueError('{} has not been retrieved by the proxy'.format(obj))
+
+    def _fetch(self, start, stop, yield_per, keep=True):
+        """Retrieve the objects at the indexes from start to stop from the
+        query
+
+        :param keep: keep the objects at their index
+        :return: a list with the objects retrieved
+        """
+        fetch_start = time.monotonic()
+        query = self._get_query()
+        order_columns = self._order_columns()
+        offset = start
+        if order_columns is not None:
+            # start at the nearest boundary before the requested objects
+            boundary = self._boundaries[bisect.bisect_right(self._boundaries, start) - 1]
+            key = self._keys_by_boundary[boundary]
+            if key is not None:
+                query = query.filter(self._after_key(order_columns, key))
+            offset = start - boundary
+        if offset:
+            query = query.offset(offset)
+        query = query.limit(stop - start)
+        if yield_per is not None:
+            query = query.yield_per(yield_per)
+        objects = query.all()
+        if keep:
+            for index, obj in enumerate(objects, start):
+                self._objects_by_index[index] = obj
+                self._indexes_by_id.setdefault(id(obj), index)
+        fetched = len(objects)
+        if fetched:
+            # adapt the batch size to the observed fetch rate
+            rate = fetched / max(time.monotonic() - fetch_start, 0.001)
+            batch_size = ((self._batch_size or fetched) + rate * self.fetch_time) / 2
+            self._batch_size = max(self.min_batch_size, min(self.max_batch_size, int(batch_size)))
+        if (self._length is None) and (fetched < stop - start):
+            # the end of the query was reached, so its length is known
+            self._length = start + fetched
+            self._estimated_length = None
+        if (order_columns is not None) and fetched:
+            self._add_boundary(start + fetched, self._sort_key(order_columns, objects[-1]))
+        return objects
+
+    def _add_boundary(self, boundary, key):
+        if (key is None) or (boundary in self._keys_by_boundary):
+            return
+        bisect.insort(self._boundaries, boundary)
+        self._keys_by_boundary[boundary] = key
+
+    @staticmethod
+    def _after_key(order_columns, key):
+        """
+        :return: a clause selecting the objects that come after the object
+            with the given sort key, written as a range on the first column,
+            so the database can seek the start of the page in an index on
+            the order columns
+        """
+        (column, descending), value = order_columns[-1], key[-1]
+        clause = (column < value) if descending else (column > value)
+        for (column, descending), value in zip(reversed(order_columns[:-1]), reversed(key[:-1])):
+            if descending:
+                clause = and_(column <= value, or_(column < value, clause))
+            else:
+                clause = and_(column >= value, or_(column > value, clause))
+        return clause
+
+    def __getitem__(self, sl, yield_per=None):
+        start = sl.start or 0
+        length = len(self)
+        stop = length if sl.stop is None else min(sl.stop, length)
+        if start < 0 or (sl.stop is not None and sl.stop < 0):
+            raise IndexError('Slice indexes should be positive')
+        query_length = self._query_length()
+        if yield_per is not None:
+            return self._iterate(start, stop, query_length, yield_per)
+        missing = [i for i in range(start, min(stop, query_length)) if i not in self._objects_by_index]
+        if missing:
+            self._fetch(missing[0], missing[-1] + 1, yield_per)
+        objects = []
+        for i in range(start, stop):
+            if i < query_length:
+                obj = self._objects_by_index.get(i)
+                if obj is not None:
+                    objects.append(obj)
+            else:
+                objects.append(self._appended[i - query_length])
+        return iter(objects)
+
+    def _iterate(self, start, stop, query_length, yield_per):
+        """Iterate over the objects from start to stop, fetching them in
+        batches of adaptive size, without keeping them"""
+        batch_size = yield_per
+        while start < min(stop, query_length):
+            batch_stop = min(start + batch_size, stop, query_length)
+            objects = self._fetch(start, batch_stop, yield_per, keep=False)
+            yield from objects
+            if len(objects) < batch_stop - start:
+                # the end of the query was reached
+                query_length = start + len(objects)
+                break
+            start = batch_stop
+            batch_size = self._batch_size
+        for i in range(max(start, query_length), stop):
+            yield self._appended[i - query_length]
@@ -5,10 +5,14 @@ Inspired by the Corba/Java NamingContext.
 from __future__ import annotations
 
 import collections
+import dataclasses
 import datetime
 import decimal
 import functools
 import logging
+import sys
+import threading
+import time
 import typing
 import weakref
 
@@ -299,6 +303,33 @@ class AbstractNamingContext(object):
         """
         raise NotImplementedError
 
+    def unbind_all(self, names: typing.Iterable[Name]) -> typing.List[CompositeName]:
+        """
+        Removes multiple named bindings from the context.
+        Names for which no binding exists are not considered an error, but are returned instead.
+
+        :param names: the names of the objects, atomic or composite, and relative to this naming context.
+
+        :return: the composite names, relative to this naming context, for which no binding was found.
+        """
+        not_found = []
+        for name in names:
+            try:
+                self.unbind(name)
+            except NameNotFoundException:
+                not_found.append(self.get_composite_name(name))
+        return not_found
+
+    def clear_context(self, name: Name) -> int:
+        """
+        Removes all mutable bindings from a subcontext, while the subcontext itself stays bound.
+
+        :param name: Name of the context, atomic or composite.
+
+        :return: the number of object bindings that were removed from the subcontext.
+        """
+        raise NotImplementedError
+
     def resolve(self, name: Name) -> object:
         """
         Retrieve the object bound to a name in the context. The given name must exactly match the bound name.
@@ -342,18 +373,20 @@ class AbstractBindingStorage(object):
     Abstract interface for name-to-object binding storage.
     """
 
-    def add(self, name, obj, immutable=False):
+    def add(self, name, obj, immutable=False, rebind=True):
         """
         Store a binding for the given name and object with the given mutability.
         If a binding already exists, an exception will be raised if it concerns an immutable binding,
-        otherwise the binding will be replaced by the new one.
+        or if rebinding is not allowed, otherwise the binding will be replaced by the new one.
 
         :param name: name under which to bind the object.
         :param obj: The object to bind with the given name
         :param immutable: flag that indicates whether the created binding should be immutable.
+        :param rebind: flag that indicates whether an existing mutable binding may be replaced.
 
         :raises:
             ImmutableBindingException NamingException.Message.binding_immutable: when an immutable binding already exists under the given name.
+            AlreadyBoundException NamingException.Message.already_bound: when a binding already exists under the given name and rebind is not allowed.
         """
         raise NotImplementedError
 
@@ -369,6 +402,25 @@ class AbstractBindingStorage(object):
         """
         raise NotImplementedError
 
+    def remove_all(self, names):
+        """
+        Remove the bindings under each of the given names.
+
+        :param names: names under which objects should have been bound.
+
+        :return: a list of the names for which no binding was found.
+
+        :raises:
+            ImmutableBindingException NamingException.Message.binding_immutable: when trying to remove an immutable binding.
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """
+        Remove all mutable bindings and return the objects that were bound.
+        """
+        raise NotImplementedError
+
     def get(self, name):
         """
         Retrieve the object bound under the given name.
@@ -389,45 +441,94 @@ class AbstractBindingStorage(object):
     def list(self):
         raise NotImplementedError
 
+    def values(self):
+        """
+        Return the objects that are bound in this binding storage.
+        """
+        raise NotImplementedError
+
     def __contains__(self, name):
         raise NotImplementedError
 
     def __len__(self):
         raise NotImplementedError
 
+# Sentinel to distinguish missing bindings from objects bound as None.
+_unbound = object()
+
 class BindingStorage(AbstractBindingStorage):
     """
     Default binding storage implementation that stores the bindings in a
     name-to-object dictionary.
+
+    The storage can be used concurrently from multiple threads, with a read path that does not lock.
+    Writers serialize on a lock and change the dictionary in place, as looking up, setting or removing
+    a single name in a dictionary is atomic.  Readers that iterate over the bindings do so over a
+    snapshot, taken while holding the lock.
     """
 
     def __init__(self, binding_type):
         self.binding_type = binding_type
         self._bindings = {}
-        self._immutable = []
-
-    def add(self, name, obj, immutable=False):
-        if name in self._bindings and name in self._immutable:
-            raise ImmutableBindingException(self.binding_type, name)
-        self._bindings[name] = obj
-        if immutable:
-            self._immutable.append(name)
+        self._immutable = set()
+        self._lock = threading.Lock()
+
+    def add(self, name, obj, immutable=False, rebind=True):
+        with self._lock:
+            if name in self._bindings:
+                if name in self._immutable:
+                    raise ImmutableBindingException(self.binding_type, name)
+                if not rebind:
+                    raise AlreadyBoundException(name, self.binding_type)
+            self._bindings[name] = obj
+            if immutable:
+                self._immutable.add(name)
 
     def remove(self, name):
-        if name not in self._bindings:
-            raise NameNotFoundException(name, self.binding_type)
-        if name in self._immutable:
-            raise ImmutableBindingException(self.binding_type, name)
-        return self._bindings.pop(name)
+        with self._lock:
+            if name not in self._bindings:
+                raise NameNotFoundException(name, self.binding_type)
+            if name in self._immutable:
+                raise ImmutableBindingException(self.binding_type, name)
+            return self._bindings.pop(name)
+
+    def remove_all(self, names):
+        not_found = []
+        with self._lock:
+            for name in names:
+                if name not in self._bindings:
+                    not_found.append(name)
+                    continue
+                if name in self._immutable:
+                    raise ImmutableBindingException(self.binding_type, name)
+                self._bindings.pop(name, None)
+        return not_found
+
+    def clear(self):
+        with self._lock:
+            removed = []
+            for name, obj in list(self._bindings.items()):
+                if name not in self._immutable:
+                    removed.append(obj)
+                    self._bindings.pop(name, None)
+        return removed
 
     def get(self, name):
-        if name not in self._bindings:
+        obj = self._bindings.get(name, _unbound)
+        if obj is _unbound:
             raise NameNotFoundException(name, self.binding_type)
-        return self._bindings[name]
+        return obj
+
+    def _snapshot(self):
+        """
+        Return a list with the names and bound objects, to iterate over.
+        """
+        with self._lock:
+            return list(self._bindings.items())
 
     def copy(self):
         duplicate = self.__class__(self.binding_type)
-        for name, obj in self._bindings.items():
+        for name, obj in self._snapshot():
             duplicate.add(name, obj, immutable=name in self._immutable)
         return duplicate
 
@@ -435,8 +536,19 @@ class BindingStorage(AbstractBindingStorage):
         """
         Return the names of the bindings as valid names (tuples)
         """
-        for key in self._bindings.keys():
-            yield (key,)
+        for name, _obj in self._snapshot():
+            yield (name,)
+
+    def values(self):
+        return [obj for _name, obj in self._snapshot()]
+
+    def approximate_size(self):
+        """
+        Return the approximate number of bytes retained by the bindings of this storage.
+        Only the shallow size of each bound object is taken into account.
+        """
+        bindings = self._snapshot()
+        return sys.getsizeof(self._bindings) + sum(sys.getsizeof(obj) for _name, obj in bindings)
 
     def __contains__(self, name):
         return name in self._bindings
@@ -458,11 +570,144 @@ class WeakValueBindingStorage(BindingStorage):
         super().__init__(binding_type)
         self._bindings = weakref.WeakValueDictionary()
 
+class LruBindingStorage(BindingStorage):
+    """
+    Binding storage implementation that keeps a bounded number of bindings, evicting the least recently used
+    mutable bindings when either the maximum number of bindings or the maximum approximate size is exceeded.
+    Immutable bindings are never evicted.
+
+    As retrieving a binding changes its recency, reads are no longer free of side effects, so in contrast to the
+    default storage, all access to this storage is serialized on its lock.
+
+    :param max_entries: the maximum number of bindings to keep.
+    :param max_bytes: the maximum approximate number of bytes retained by the bound objects, `None` if the
+        size should not be limited.
+    :param sizeof: the function used to determine the approximate size of a bound object.
+
+    .. attribute:: hits
+
+        the number of successful retrievals.
+
+    .. attribute:: misses
+
+        the number of retrievals of names that were not bound.
+
+    .. attribute:: evictions
+
+        the number of bindings removed to respect the limits of the storage.
+    """
+
+    def __init__(self, binding_type, max_entries=1000, max_bytes=None, sizeof=sys.getsizeof):
+        super().__init__(binding_type)
+        assert max_entries > 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._bindings = collections.OrderedDict()
+        self._sizes = {}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def add(self, name, obj, immutable=False, rebind=True):
+        with self._lock:
+            if name in self._bindings:
+                if name in self._immutable:
+                    raise ImmutableBindingException(self.binding_type, name)
+                if not rebind:
+                    raise AlreadyBoundException(name, self.binding_type)
+                self._discard(name)
+            size = self.sizeof(obj)
+            self._bindings[name] = obj
+            self._sizes[name] = size
+            self._size += size
+            if immutable:
+                self._immutable.add(name)
+            self._evict()
+
+    def _discard(self, name):
+        self._size -= self._sizes.pop(name)
+        return self._bindings.pop(name)
+
+    def _evict(self):
+        """
+        Remove the least recently used mutable bindings, until the limits are respected.
+        """
+        for name in list(self._bindings.keys()):
+            if (len(self._bindings) <= self.max_entries) and (self.max_bytes is None or self._size <= self.max_bytes):
+                break
+            if name in self._immutable:
+                continue
+            self._discard(name)
+            self.evictions += 1
+
+    def remove(self, name):
+        with self._lock:
+            if name not in self._bindings:
+                raise NameNotFoundException(name, self.binding_type)
+            if name in self._immutable:
+                raise ImmutableBindingException(self.binding_type, name)
+            return self._discard(name)
+
+    def remove_all(self, names):
+        not_found = []
+        with self._lock:
+            for name in names:
+                if name not in self._bindings:
+                    not_found.append(name)
+                    continue
+                if name in self._immutable:
+                    raise ImmutableBindingException(self.binding_type, name)
+                self._discard(name)
+        return not_found
+
+    def clear(self):
+        with self._lock:
+            removed = [self._discard(name) for name in list(self._bindings.keys()) if name not in self._immutable]
+        return removed
+
+    def get(self, name):
+        with self._lock:
+            obj = self._bindings.get(name, _unbound)
+            if obj is _unbound:
+                self.misses += 1
+                raise NameNotFoundException(name, self.binding_type)
+            self._bindings.move_to_end(name)
+            self.hits += 1
+            return obj
+
+    def copy(self):
+        duplicate = self.__class__(self.binding_type, self.max_entries, self.max_bytes, self.sizeof)
+        for name, obj in self.values_by_name():
+            duplicate.add(name, obj, immutable=name in self._immutable)
+        return duplicate
+
+    def values_by_name(self):
+        """
+        Return a list with the names and bound objects, from the least to the most recently used.
+        """
+        with self._lock:
+            return list(self._bindings.items())
+
+    def list(self):
+        for name, _obj in self.values_by_name():
+            yield (name,)
+
+    def values(self):
+        return [obj for _name, obj in self.values_by_name()]
+
+    def approximate_size(self):
+        return sys.getsizeof(self._bindings) + self._size
+
 class NamingContext(AbstractNamingContext):
     """
     Represents a naming context, which consists of a set of name-to-object bindings.
     It implements the AbstractNamingContext interface to provide methods for adding, examining and updating these bindings,
     as well as to define subcontexts that take part in recursive resolving of names.
+
+    A NamingContext is safe for concurrent use : names are resolved without locking, while changes to the
+    bindings are serialized by the binding storage.
     """
 
     def __init__(self):
@@ -625,18 +870,22 @@ class NamingContext(AbstractNamingContext):
         if binding_type not in BindingType:
             raise NamingException(NamingException.Message.invalid_binding_type)
         if len(name) == 1:
-            # If binding, check if their exists one already
-            if name[0] in self._bindings[binding_type] and not rebind:
-                raise AlreadyBoundException(name[0], binding_type)
-            # Add the object and its mutability to the registry for the given binding_type.
-            self._bindings[binding_type].add(name[0], obj, immutable)
             # Determine the full qualified named of the bound object (extending that of this NamingContext).
             qual_name = self.get_qual_name(name[0])
-            # If the object is a NamingContext, assign the qualified name.
+            # If the object is a NamingContext, assign the qualified name before publishing the binding,
+            # so concurrent readers never resolve a context that is not bound yet.
             if binding_type == BindingType.named_context:
                 if obj._name is not None:
                     raise AlreadyBoundException(name[0], binding_type)
                 obj._name = qual_name
+            # Add the object and its mutability to the registry for the given binding_type,
+            # the storage checks if a binding exists already, as part of the same atomic update.
+            try:
+                self._bindings[binding_type].add(name[0], obj, immutable, rebind=rebind)
+            except NamingException:
+                if binding_type == BindingType.named_context:
+                    obj._name = None
+                raise
             return qual_name
         else:
             context = self._bindings[BindingType.named_context].get(name[0])
@@ -686,6 +935,70 @@ class NamingContext(AbstractNamingContext):
         """
         self._remove_binding(name, BindingType.named_context)
 
+    @AbstractNamingContext.check_bounded
+    def unbind_all(self, names: typing.Iterable[Name]) -> typing.List[CompositeName]:
+        """
+        Removes multiple object bindings from this NamingContext in a single pass.
+        The names are grouped by their first atomic part, so each subcontext is resolved only once,
+        and the remaining parts of all names within that subcontext are passed to it at once.
+        In contrast to unbind(), names for which no binding was found will not raise an exception, but are returned instead.
+
+        :param names: names under which the objects should have been bound, atomic or composite, and relative to this naming context.
+
+        :return: a list with the composite names, relative to this naming context, for which no binding was found.
+
+        :raises:
+            UnboundException NamingException.unbound: if this NamingContext has not been bound to a name yet.
+            NamingException NamingException.Message.invalid_name: when one of the names is invalid (None or length less than 1).
+            ImmutableBindingException NamingException.Message.binding_immutable: when trying to unbind an immutable object binding.
+        """
+        atomic_names = []
+        names_by_context = collections.defaultdict(list)
+        for name in names:
+            name = self.get_composite_name(name)
+            if len(name) == 1:
+                atomic_names.append(name[0])
+            else:
+                names_by_context[name[0]].append(name[1:])
+        not_found = [(name,) for name in self._bindings[BindingType.named_object].remove_all(atomic_names)]
+        contexts = self._bindings[BindingType.named_context]
+        for context_name, context_names in names_by_context.items():
+            if context_name not in contexts:
+                not_found.extend((context_name, *name) for name in context_names)
+                continue
+            context = contexts.get(context_name)
+            not_found.extend((context_name, *name) for name in context.unbind_all(context_names))
+        return not_found
+
+    @AbstractNamingContext.check_bounded
+    def clear_context(self, name: Name) -> int:
+        """
+        Remove all mutable bindings from the context bound under the given name in this NamingContext,
+        for example to release all names of a closed view at once.
+        The context itself stays bound, as well as the immutable bindings within it.
+
+        :param name: name under which the context should have been bound, atomic or composite, and relative to this naming context.
+
+        :return: the number of object bindings that were removed from the context.
+
+        :raises:
+            UnboundException NamingException.unbound: if this NamingContext has not been bound to a name yet.
+            NamingException NamingException.Message.invalid_name: when the name is invalid (None or length less than 1).
+            NameNotFoundException NamingException.Message.name_not_found: if no context binding was found for the given name.
+        """
+        return self.resolve_context(name).clear()
+
+    def clear(self) -> int:
+        """
+        Remove all mutable object and context bindings from this NamingContext.
+        The removed contexts get unbound and will not be usable unless they are reassociated.
+
+        :return: the number of object bindings that were removed.
+        """
+        for context in self._bindings[BindingType.named_context].clear():
+            context._name = None
+        return len(self._bindings[BindingType.named_object].clear())
+
     @AbstractNamingContext.check_bounded
     def _remove_binding(self, name: Name, binding_type: BindingType) -> None:
         """
@@ -1045,6 +1358,102 @@ class WeakRefNamingContext(NamingContext):
         super().__init__()
         self._bindings[BindingType.named_object] = WeakValueBindingStorage(BindingType.named_object)
 
+class CacheNamingContext(NamingContext):
+    """
+    Specialized naming context that keeps a bounded cache of name-to-object bindings.
+    In contrast to the `camelot.core.naming.WeakRefNamingContext`, bound objects are kept alive by this context,
+    until they are evicted in least recently used order, when either the number of bindings or their approximate
+    size in bytes exceed the limits of this context.
+
+    A primary use case for this context is caching expensive objects for a while, independent of other references
+    to them, while keeping the memory used by the cache predictable.
+
+    :param max_entries: the maximum number of object bindings in this context.
+    :param max_bytes: the maximum approximate size of the objects bound in this context, `None` if their size
+        should not be limited.
+    :param sizeof: the function used to determine the approximate size of a bound object, this defaults to
+        `sys.getsizeof`, which only takes the shallow size of an object into account.
+    """
+
+    def __init__(self, max_entries=1000, max_bytes=None, sizeof=sys.getsizeof):
+        super().__init__()
+        self._bindings[BindingType.named_object] = LruBindingStorage(
+            BindingType.named_object, max_entries, max_bytes, sizeof
+        )
+
+    def new_context(self) -> CacheNamingContext:
+        """
+        Create and return a new instance of this context class, with the same limits.
+
+        :return: an instance of `camelot.core.naming.CacheNamingContext`
+        """
+        storage = self._bindings[BindingType.named_object]
+        return self.__class__(storage.max_entries, storage.max_bytes, storage.sizeof)
+
+    @property
+    def hits(self) -> int:
+        """The number of names resolved to an object bound in this context"""
+        return self._bindings[BindingType.named_object].hits
+
+    @property
+    def misses(self) -> int:
+        """The number of names resolved that were not bound in this context"""
+        return self._bindings[BindingType.named_object].misses
+
+    @property
+    def evictions(self) -> int:
+        """The number of object bindings evicted from this context"""
+        return self._bindings[BindingType.named_object].evictions
+
+@dataclasses.dataclass
+class NamingContextStatistics(object):
+    """
+    Statistics on the bindings of a naming context within the context hierarchy of the initial naming context.
+
+    .. attribute:: name
+
+        the fully qualified composite name of the context.
+
+    .. attribute:: object_count
+
+        the number of object bindings in the context itself.
+
+    .. attribute:: context_count
+
+        the number of context bindings in the context itself.
+
+    .. attribute:: total_count
+
+        the number of object bindings in the context and all of its subcontexts.
+
+    .. attribute:: growth
+
+        the change of the total count since the previous statistics sample.
+
+    .. attribute:: growth_rate
+
+        the change of the total count per second since the previous statistics sample.
+
+    .. attribute:: memory
+
+        the approximate number of bytes retained by the object bindings of the context
+        and all of its subcontexts, `None` if the memory was not measured.
+
+    .. attribute:: unbounded
+
+        `True` if the total count of the context grew in each of the last samples,
+        which indicates the context might grow without bound.
+    """
+
+    name: CompositeName
+    object_count: int = 0
+    context_count: int = 0
+    total_count: int = 0
+    growth: int = 0
+    growth_rate: float = 0.0
+    memory: typing.Optional[int] = None
+    unbounded: bool = False
+
 class InitialNamingContext(NamingContext, metaclass=Singleton):
     """
     Singleton class that is the starting context for performing naming operations.
@@ -1070,6 +1479,10 @@ class InitialNamingContext(NamingContext, metaclass=Singleton):
         self.bind_new_context('object', immutable=True)
         self.bind_new_context('leases', immutable=True)
         self.bind_context('transient', WeakRefNamingContext(), immutable=True)
+        self.bind_context('cache', CacheNamingContext(), immutable=True)
+        # The total count and growth streak of each context at the time of the previous statistics sample.
+        self._statistics_sample = {}
+        self._statistics_time = None
 
     def new_context(self) -> NamingContext:
         """
@@ -1081,6 +1494,66 @@ class InitialNamingContext(NamingContext, metaclass=Singleton):
         """
         return NamingContext()
 
+    # Number of consecutive samples a context should grow in before it is flagged as unbounded.
+    unbounded_growth_samples = 5
+
+    def get_statistics(self, memory=False) -> typing.List[NamingContextStatistics]:
+        """
+        Sample the number of bindings of each naming context in the hierarchy, and their growth since the previous sample.
+        Counting the bindings only takes the number of contexts into account, so this method is cheap enough to
+        be sampled periodically.  Measuring the retained memory requires visiting all bound objects.
+
+        :param memory: flag that indicates whether the approximate memory retained by each context should be measured.
+
+        :return: a list of `camelot.core.naming.NamingContextStatistics`, one for each context, with parents
+            preceding their subcontexts.
+        """
+        statistics = []
+        self._collect_statistics(self, memory, statistics)
+        now = time.monotonic()
+        sample = {}
+        for context_statistics in statistics:
+            streak = 0
+            previous = self._statistics_sample.get(context_statistics.name)
+            if previous is not None:
+                previous_count, previous_streak = previous
+                context_statistics.growth = context_statistics.total_count - previous_count
+                if now > self._statistics_time:
+                    context_statistics.growth_rate = context_statistics.growth / (now - self._statistics_time)
+                if context_statistics.growth > 0:
+                    streak = previous_streak + 1
+            context_statistics.unbounded = (streak >= self.unbounded_growth_samples)
+            sample[context_statistics.name] = (context_statistics.total_count, streak)
+        self._statistics_sample = sample
+        self._statistics_time = now
+        return statistics
+
+    @classmethod
+    def _collect_statistics(cls, context, memory, statistics) -> NamingContextStatistics:
+        """
+        Helper method that appends the statistics of a context and its subcontexts to a list,
+        and returns the statistics of the context with the totals of its subtree.
+        """
+        objects = context._bindings[BindingType.named_object]
+        contexts = context._bindings[BindingType.named_context]
+        context_statistics = NamingContextStatistics(
+            name=context._name,
+            object_count=len(objects),
+            context_count=len(contexts),
+            total_count=len(objects),
+            memory=objects.approximate_size() if memory else None,
+        )
+        statistics.append(context_statistics)
+        for subcontext in contexts.values():
+            # Endpoint contexts store no bindings
+            if not isinstance(subcontext, NamingContext):
+                continue
+            subcontext_statistics = cls._collect_statistics(subcontext, memory, statistics)
+            context_statistics.total_count += subcontext_statistics.total_count
+            if memory:
+                context_statistics.memory += subcontext_statistics.memory
+        return context_statistics
+
     def _bind_object(self, obj):
         """
         Helper method for binding any type of python object under the appropriate name.
@@ -42,10 +42,26 @@ logger = logging.getLogger('camelot.core.utils')
 # current locale
 #
 _translations_ = {}
+#
+# Incremented each time the translations change, to be used as the version
+# of cached data that contains translated strings
+#
+_translations_version = 0
 
 def set_translation(source, value):
     """Store a tranlation in the global translation dictionary"""
     _translations_[source] = value
+    translations_changed()
+
+def translations_changed():
+    """Inform that the translations changed, because a translation was
+    stored, or translators were installed or removed"""
+    global _translations_version
+    _translations_version += 1
+
+def get_translations_version():
+    """:return: the number of times the translations changed"""
+    return _translations_version
 
 def ugettext(string_to_translate, msgctxt=None, cardinality=-1):
     """Translate the string_to_translate to the language of the current locale.
@@ -32,7 +32,7 @@ from .application import (
     MainMenu, UpdateActionsState, SetThemeColors, Authenticate, StartProfiler,
     StopProfiler,
 )
-from .change_object import ChangeObject, ChangeObjects, QmlChangeObjects
+from .change_object import ChangeObject, ChangeObjects, InvalidRows, QmlChangeObjects
 from .form_view import OpenFormView, HighlightForm, CloseMenu
 from .gui import (
     CloseView, MessageBox, Refresh, SelectItem
@@ -72,6 +72,7 @@ __all__ = [
     Exit.__name__,
     FlushSession.__name__,
     InstallTranslator.__name__,
+    InvalidRows.__name__,
     MainMenu,
     SetThemeColors.__name__,
     MainWindow.__name__,
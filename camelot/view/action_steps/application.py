@@ -33,10 +33,11 @@ import typing
 
 from ...admin.action.base import ActionStep, State, ModelContext
 from ...admin.action.application_action import model_context_naming, model_context_counter
+from ...admin.action.state_engine import state_engine
 from ...admin.admin_route import AdminRoute, Route
 from ...admin.menu import MenuItem
-from ...core.naming import initial_naming_context
 from ...core.serializable import DataclassSerializable
+from ...core.utils import translations_changed
 
 LOGGER = logging.getLogger(__name__)
 
@@ -133,13 +134,16 @@ class NavigationPanel(ActionStep, DataclassSerializable):
         """
         Recurse through a menu and get the state for all actions in the menu
         """
+        action_states.extend(state_engine.get_states(
+            model_context, self._action_routes(items)
+        ))
+
+    @classmethod
+    def _action_routes(self, items):
         for item in items:
-            self._add_action_states(model_context, item.items, action_states)
-            action_route = item.action_route
-            if action_route is not None:
-                action = initial_naming_context.resolve(action_route)
-                state = action.get_state(model_context)
-                action_states.append((action_route, state))
+            yield from self._action_routes(item.items)
+            if item.action_route is not None:
+                yield item.action_route
 
 
 @dataclass
@@ -166,13 +170,16 @@ class MainMenu(ActionStep, DataclassSerializable):
         """
         Recurse through a menu and get the state for all actions in the menu
         """
+        action_states.extend(state_engine.get_states(
+            model_context, self._action_routes(items)
+        ))
+
+    @classmethod
+    def _action_routes(self, items):
         for item in items:
-            self._add_action_states(model_context, item.items, action_states)
-            action_route = item.action_route
-            if action_route is not None:
-                action = initial_naming_context.resolve(action_route)
-                state = action.get_state(model_context)
-                action_states.append((action_route, state))
+            yield from self._action_routes(item.items)
+            if item.action_route is not None:
+                yield item.action_route
 
 
 @dataclass
@@ -187,6 +194,9 @@ class InstallTranslator(ActionStep, DataclassSerializable):
     blocking = False
     language: str
 
+    def __post_init__(self):
+        translations_changed()
+
 
 @dataclass
 class RemoveTranslators(ActionStep, DataclassSerializable):
@@ -194,6 +204,9 @@ class RemoveTranslators(ActionStep, DataclassSerializable):
     Unregister all previously installed translators from the application.
     """
 
+    def __post_init__(self):
+        translations_changed()
+
 
 @dataclass
 class UpdateActionsState(ActionStep, DataclassSerializable):
@@ -26,12 +26,15 @@
 #  SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 #  ============================================================================
+import time
 import typing
 from dataclasses import dataclass, field
-from typing import List, Union
+from typing import ClassVar, List, Union
 
+from camelot.admin.action import ActionStep
 from camelot.admin.icon import Icon
 from camelot.core.naming import initial_naming_context
+from camelot.core.serializable import DataclassSerializable
 from camelot.core.utils import ugettext_lazy, ugettext_lazy as _
 from .form_view import OpenFormView
 from .item_view import UpdateTableView
@@ -78,6 +81,25 @@ class ChangeObject(OpenFormView):
         return self.get_objects()[0]
 
 
+@dataclass
+class InvalidRows(ActionStep, DataclassSerializable):
+    """
+    Inform a :class:`ChangeObjects` dialog about the progress of the
+    validation of its objects.
+
+    :param rows: the invalid rows found since the previous step
+    :param value: the number of rows validated
+    :param maximum: the number of rows to validate
+    :param finished: `True` if all rows are validated
+    """
+
+    rows: List[int] = field(default_factory=list)
+    value: int = 0
+    maximum: int = 0
+    finished: bool = False
+    blocking: bool = False
+
+
 @dataclass
 class ChangeObjects(UpdateTableView):
     """
@@ -90,6 +112,15 @@ class ChangeObjects(UpdateTableView):
         visible objects will be validated.  But validation of all  objects might
         take a lot of time.
 
+    The objects are validated in the background, while the dialog is shown.
+    The invalid rows are sent to the dialog in :class:`InvalidRows` steps,
+    each time the validation ran for `validation_time` seconds.  Set
+    `validate_in_background` to `False` to validate all objects before the
+    dialog is shown.  The dialog does not allow the user to accept the
+    objects as long as `validating` is set, or rows are invalid.  Accessing
+    the `invalid_rows` attribute validates the objects that were not yet
+    validated in the background.
+
     .. image:: /_static/listactions/import_from_file_preview.png
 
     This action step can be customised using these attributes :
@@ -113,10 +144,16 @@ class ChangeObjects(UpdateTableView):
 
     """
 
+    # validate the objects while the dialog is shown
+    validate_in_background: ClassVar[bool] = True
+    # the number of seconds of validation between two InvalidRows steps
+    validation_time: ClassVar[float] = 0.1
+
     validate: bool = True
     qml: bool = False
 
-    invalid_rows: List = field(init=False, default_factory=list)
+    # more invalid rows will be sent in InvalidRows steps
+    validating: bool = field(init=False, default=False)
     admin_route: AdminRoute = field(init=False)
     window_title: str = field(init=False)
     title: Union[str, ugettext_lazy] = field(init=False, default_factory=lambda: _('Data Preview'))
@@ -128,12 +165,67 @@ class ChangeObjects(UpdateTableView):
         self.admin_route = admin.get_admin_route()
         self.window_title = admin.get_verbose_name_plural()
         self.qml = True
+        self._invalid_rows = []
+        self._validation = None
         if self.validate:
-            validator = admin.get_validator()
-            for row, obj in enumerate(value):
-                for _message in validator.validate_object(obj):
-                    self.invalid_rows.append(row)
-                    break
+            validation = self._validate(value, admin.get_validator())
+            if self.validate_in_background:
+                self._validation = validation
+                self.validating = True
+            else:
+                for _step in validation:
+                    pass
+
+    def _validate(self, objects, validator):
+        """
+        Generator validating the objects, yielding an :class:`InvalidRows`
+        step each time it ran for `validation_time` seconds.
+        """
+        maximum = len(objects) if hasattr(objects, '__len__') else 0
+        rows = []
+        row = -1
+        deadline = time.monotonic() + self.validation_time
+        for row, obj in enumerate(objects):
+            for _message in validator.validate_object(obj):
+                rows.append(row)
+                break
+            if time.monotonic() >= deadline:
+                self._invalid_rows.extend(rows)
+                yield InvalidRows(rows, row + 1, maximum)
+                rows = []
+                deadline = time.monotonic() + self.validation_time
+        self._invalid_rows.extend(rows)
+        yield InvalidRows(rows, row + 1, maximum, finished=True)
+
+    def _finish_validation(self):
+        """Validate the objects that were not yet validated in the background"""
+        validation, self._validation = self._validation, None
+        if validation is not None:
+            for _step in validation:
+                pass
+        self.validating = False
+
+    @property
+    def invalid_rows(self):
+        """
+        The rows of the invalid objects, accessing this attribute finishes
+        the validation of all objects.
+        """
+        self._finish_validation()
+        return self._invalid_rows
+
+    @classmethod
+    def serialize_fields(cls, obj):
+        serialized = super().serialize_fields(obj)
+        # only the rows validated so far, the others follow in InvalidRows steps
+        serialized['invalid_rows'] = list(obj._invalid_rows)
+        return serialized
+
+    def background_steps(self):
+        if self._validation is not None:
+            # closing the background steps does not close the validation,
+            # so the remaining objects can still be validated afterwards
+            return (step for step in self._validation)
 
     @staticmethod
     def _add_actions(admin, actions):
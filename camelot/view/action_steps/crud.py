@@ -1,5 +1,6 @@
 import logging
 import typing
+import weakref
 
 logger = logging.getLogger(__name__)
 
@@ -7,7 +8,9 @@ from camelot.view.controls import DelegateType
 from camelot.admin.admin_route import Route
 from camelot.admin.action.base import ActionStep, State
 from camelot.admin.icon import CompletionValue
-from camelot.core.serializable import DataclassSerializable
+from camelot.core.cache import field_attributes_changes
+from camelot.core.serializable import DataclassSerializable, json_encoder
+from camelot.core.utils import get_translations_version
 from camelot.view.crud_action import CrudActions, DataUpdate
 from camelot.view.utils import get_settings_group
 
@@ -29,6 +32,9 @@ class RowCount(ActionStep, DataclassSerializable):
     blocking: ClassVar[bool] = False
 
     rows: typing.Optional[int] = None
+    # `False` if the number of rows is an estimate, to be followed by
+    # another row count with the exact number
+    exact: bool = True
 
 
 @dataclass
@@ -45,8 +51,21 @@ class DataColumn(ActionStep, DataclassSerializable):
 
 @dataclass
 class SetColumns(ActionStep, DataclassSerializable):
+    """
+    The columns of a table view, with the state of their delegates.
+
+    The columns and their encoded payload are cached per admin and field
+    names, and reused by other views of the same admin, as long as the
+    version of the field attributes of the admin, counted by
+    :data:`camelot.core.cache.field_attributes_changes`, and the translations
+    remain the same.
+    Use :meth:`invalidate` when the field attributes of an admin changed.
+    The cached columns should not be modified.
+    """
 
     blocking: ClassVar[bool] = False
+    # the columns and their encoded payload, by field names, per admin
+    _cache: ClassVar[weakref.WeakKeyDictionary] = weakref.WeakKeyDictionary()
 
     admin: InitVar[Any]
     static_field_attributes: InitVar[Any]
@@ -54,6 +73,40 @@ class SetColumns(ActionStep, DataclassSerializable):
     columns: List[DataColumn] = field(default_factory=list)
 
     def __post_init__(self, admin, static_field_attributes):
+        static_field_attributes = list(static_field_attributes)
+        self._entry = None
+        version = field_attributes_changes.get(admin)
+        if version is None:
+            self._add_columns(admin, static_field_attributes)
+            return
+        # the verbose names of the columns are translated
+        version = (version, get_translations_version())
+        key = tuple(fa['field_name'] for fa in static_field_attributes)
+        entries = self._cache.setdefault(admin, dict())
+        entry = entries.get(key)
+        if entry is None or entry[0] != version:
+            self._add_columns(admin, static_field_attributes)
+            entry = entries[key] = [version, self.columns, None]
+        self.columns = entry[1]
+        self._entry = entry
+
+    @staticmethod
+    def invalidate(admin):
+        """
+        Recreate the cached columns of an admin the next time they are
+        requested, because its field attributes changed.
+        """
+        field_attributes_changes.changed([admin])
+
+    def write_object(self, stream):
+        entry = self._entry
+        if entry is None or entry[1] is not self.columns:
+            return super().write_object(stream)
+        if entry[2] is None:
+            entry[2] = json_encoder.encode(self.asdict(self))
+        stream.write(entry[2])
+
+    def _add_columns(self, admin, static_field_attributes):
         columns = admin.get_columns()
         for fa in static_field_attributes:
             field_name = fa['field_name']
@@ -32,15 +32,15 @@ Various ``ActionStep`` subclasses that manipulate the `item_view`
 """
 
 from dataclasses import dataclass, InitVar, field
-from typing import Union, List, Tuple, Any
+from typing import Any, List, Optional, Tuple, Union
 import logging
 
 from ...admin import AbstractAdmin
 from ...admin.admin_route import Route, RouteWithRenderHint
 from ...admin.action import ActionStep, State
 from ...admin.action.application_action import model_context_naming, model_context_counter
+from ...admin.action.state_engine import state_engine
 from ...admin.model_context import ObjectsModelContext
-from ...core.cache import ValueCache
 from ...core.item_model import AbstractModelProxy
 from ...core.naming import initial_naming_context
 from ...core.qt import Qt, QtCore
@@ -96,10 +96,9 @@ class AbstractCrudView(ActionStep, DataclassSerializable):
 
     @staticmethod
     def _add_action_states(model_context, actions, action_states):
-        for action_route in actions:
-            action = initial_naming_context.resolve(action_route.route)
-            state = action.get_state(model_context)
-            action_states.append((action_route.route, state))
+        action_states.extend(state_engine.get_states(
+            model_context, [action_route.route for action_route in actions]
+        ))
 
     def get_objects(self):
         """Use this method to get access to the objects to change in unit tests
@@ -134,12 +133,11 @@ class UpdateTableView(AbstractCrudView):
         assert (search_text is None) or isinstance(search_text, str)
         self.title = admin.get_verbose_name_plural()
         self._add_actions(admin, self.actions)
-        for field_name in admin.get_columns():
-            fa = list(admin.get_static_field_attributes([field_name]))
-            self.columns.append(Column(field_name, fa[0]['name'], True))
-        for field_name in admin.get_extra_columns():
-            fa = list(admin.get_static_field_attributes([field_name]))
-            self.columns.append(Column(field_name, fa[0]['name'], False))
+        columns = list(admin.get_columns())
+        field_names = columns + list(admin.get_extra_columns())
+        static_field_attributes = admin.get_cached_static_field_attributes(field_names)
+        for i, (field_name, fa) in enumerate(zip(field_names, static_field_attributes)):
+            self.columns.append(Column(field_name, fa['name'], i < len(columns)))
         self.list_action = admin.get_list_action()
         self.close_route = None
         if proxy is None:
@@ -231,10 +229,42 @@ class SetSelection(ActionStep, DataclassSerializable):
 class RefreshItemView(ActionStep, DataclassSerializable):
     """
     Refresh only the current item view
+
+    :param model_context: the model context of the item view
+    :param objects: the objects of which the data should be refreshed, `None`
+        to refresh all objects
+    :param field_names: the names of the fields of which the data should
+        be refreshed, `None` to refresh all fields
+
+    .. attribute:: rows
+
+        the rows the view should request again, `None` if all rows should
+        be requested again
+
+    .. attribute:: columns
+
+        the columns the view should request again, `None` if all columns
+        should be requested again
+
+    Only when neither objects nor field names are given, the whole item cache
+    is cleared and all rows and columns are recomputed.
     """
 
     model_context: InitVar[Any]
+    objects: InitVar[Optional[List[Any]]] = None
+    field_names: InitVar[Optional[List[str]]] = None
     blocking: bool = False
 
-    def __post_init__(self, model_context):
-        model_context.item_cache = ValueCache(model_context.item_cache.max_entries)
+    rows: Optional[List[int]] = field(init=False, default=None)
+    columns: Optional[List[int]] = field(init=False, default=None)
+
+    def __post_init__(self, model_context, objects, field_names):
+        if objects is None and field_names is None:
+            model_context.reset_item_cache()
+            return
+        if field_names is not None:
+            self.columns = [
+                column for column, fa in enumerate(model_context.static_field_attributes)
+                if fa['field_name'] in field_names
+            ]
+        self.rows = model_context.item_cache.invalidate(objects, self.columns)
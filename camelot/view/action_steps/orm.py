@@ -51,6 +51,7 @@ import logging
 import typing
 
 from ...admin.action.base import ActionStep
+from ...core.cache import entity_changes, entity_rows, entity_value_cache
 from ...core.naming import CompositeName, initial_naming_context
 from ...core.serializable import DataclassSerializable
 
@@ -75,6 +76,15 @@ class CreateUpdateDelete(ActionStep, DataclassSerializable):
     created: typing.Union[CompositeName, None] = field(init=False, default=None)
 
     def __post_init__(self, objects_deleted, objects_updated, objects_created):
+        # invalidate the shared row data once, instead of in each view, and
+        # inform the model context of each view of its rows that changed
+        rows_by_view = entity_value_cache.invalidate(itertools.chain(objects_deleted, objects_updated))
+        for view, rows in rows_by_view.items():
+            model_context = entity_rows.owner(view)
+            if model_context is not None:
+                model_context.rows_changed(rows)
+        # changed objects get a new version stamp, so their rows are recomputed
+        entity_changes.changed(objects_updated)
         if len(objects_deleted):
             self.deleted = leases.bind(str(next(self._lease_counter)), objects_deleted)
         if len(objects_updated):
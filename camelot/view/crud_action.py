@@ -12,6 +12,9 @@ from camelot.core.serializable import DataclassSerializable
 from dataclasses import dataclass, field, InitVar
 from typing import Any, Dict, List, Optional
 
+# Marks a role that was not in a cell sent before.
+_missing = object()
+
 @dataclass
 class DataCell(DataclassSerializable):
 
@@ -30,6 +33,92 @@ class DataCell(DataclassSerializable):
         return item
 
 
+@dataclass
+class ColumnarCells(DataclassSerializable):
+    """
+    The cells of a :class:`DataUpdate`, laid out per column and per role
+    instead of per cell, to avoid repeating what the cells have in common.
+
+    :param cells: a list of `DataCell` objects
+    :param template: a `DataCell` of which the roles are used as defaults
+        for all cells, such as `invalid_item`
+
+    .. attribute:: rows
+
+        the row of each cell
+
+    .. attribute:: columns
+
+        the column of each cell
+
+    .. attribute:: column_flags
+
+        a `dict` mapping each column to the flags of the cells in that column
+
+    .. attribute:: flags
+
+        a `dict` mapping the index of a cell to its flags, for the cells with
+        other flags than those of their column
+
+    .. attribute:: roles
+
+        a `dict` mapping a role to a list with the value of that role for
+        each cell, `None` if the role is not set for the cell
+
+    .. attribute:: defaults
+
+        a `dict` mapping a role to the value of that role for all cells, for
+        the roles of the template that are not in `roles`
+    """
+
+    cells: InitVar
+    template: InitVar = None
+
+    rows: List[int] = field(default_factory=list)
+    columns: List[int] = field(default_factory=list)
+    column_flags: Dict[int, int] = field(default_factory=dict)
+    flags: Dict[int, int] = field(default_factory=dict)
+    roles: Dict[int, List[Any]] = field(default_factory=dict)
+    defaults: Dict[int, Any] = field(default_factory=dict)
+
+    def __post_init__(self, cells, template):
+        template_roles = template.roles if template is not None else {}
+        column_flags = self.column_flags
+        all_roles = set()
+        for i, cell in enumerate(cells):
+            self.rows.append(cell.row)
+            self.columns.append(cell.column)
+            flags = column_flags.setdefault(cell.column, cell.flags)
+            if flags != cell.flags:
+                self.flags[i] = cell.flags
+            all_roles.update(cell.roles.keys())
+        for role in all_roles.union(template_roles.keys()):
+            values = [cell.roles.get(role) for cell in cells]
+            default = template_roles.get(role)
+            if all(value == default for value in values):
+                if role in template_roles:
+                    self.defaults[role] = default
+                continue
+            self.roles[role] = values
+
+    def get_cells(self):
+        """
+        :return: the list of `DataCell` objects in this layout, with the
+            roles that are not set for a cell as `None`
+        """
+        cells = []
+        for i, (row, column) in enumerate(zip(self.rows, self.columns)):
+            roles = dict(self.defaults)
+            for role, values in self.roles.items():
+                roles[role] = values[i]
+            cells.append(DataCell(
+                row=row, column=column,
+                flags=self.flags.get(i, self.column_flags[column]),
+                roles=roles,
+            ))
+        return cells
+
+
 @dataclass
 class DataRowHeader(DataclassSerializable):
 
@@ -46,16 +135,72 @@ class DataRowHeader(DataclassSerializable):
 
 @dataclass
 class DataUpdate(DataclassSerializable):
+    """
+    :param changed_ranges: an iterable of `(row, header_item, items)` tuples,
+        with the cells of the changed rows
+    :param sent_cells: a `dict` mapping `(row, column)` tuples to the
+        `DataCell` last sent to the view, updated with the cells in this
+        update.  When given, only the roles that changed since the cell was
+        last sent are included, and unchanged cells are left out.
+    :param template: a `DataCell` such as `invalid_item`.  When given, the
+        cells are sent as `columnar_cells` instead of `cells`, with the
+        roles of the template as shared defaults.  Changed cells are then
+        sent with all their roles.
+
+    .. attribute:: delta
+
+        `True` if the cells only contain the roles that changed, the other
+        roles of the cells in the view should be kept
+
+    .. attribute:: columnar_cells
+
+        a `ColumnarCells` with the cells, if a template was given
+    """
 
     changed_ranges: InitVar
+    sent_cells: InitVar = None
+    template: InitVar = None
 
     header_items: List[DataRowHeader] = field(default_factory=list)
     cells: List[DataCell] = field(default_factory=list)
+    delta: bool = field(init=False, default=False)
+    columnar_cells: Optional[ColumnarCells] = field(init=False, default=None)
 
-    def __post_init__(self, changed_ranges):
+    def __post_init__(self, changed_ranges, sent_cells, template):
+        self.delta = (sent_cells is not None) and (template is None)
         for row, header_item, items in changed_ranges:
             self.header_items.append(header_item)
-            self.cells.extend(items)
+            if sent_cells is None:
+                self.cells.extend(items)
+            else:
+                self.cells.extend(self._changed_cells(items, sent_cells, self.delta))
+        if template is not None:
+            self.columnar_cells = ColumnarCells(self.cells, template)
+            self.cells = []
+
+    @staticmethod
+    def _changed_cells(items, sent_cells, delta=True):
+        for item in items:
+            key = (item.row, item.column)
+            previous = sent_cells.get(key)
+            sent_cells[key] = item
+            if previous is None:
+                yield item
+                continue
+            if not delta:
+                if (item.roles != previous.roles) or (item.flags != previous.flags):
+                    yield item
+                continue
+            roles = {
+                role: value for role, value in item.roles.items()
+                if previous.roles.get(role, _missing) != value
+            }
+            # roles no longer set are cleared, unless they were None already
+            for role in previous.roles.keys() - item.roles.keys():
+                if previous.roles[role] is not None:
+                    roles[role] = None
+            if roles or (item.flags != previous.flags):
+                yield DataCell(row=item.row, column=item.column, flags=item.flags, roles=roles)
 
 
 invalid_item = DataCell()
@@ -94,3 +239,4 @@ class CrudActions(DataclassSerializable):
     field_action: Route = field(init=False, default=('crud_action', 'field_action'))
     completion: Route = field(init=False, default=('crud_action', 'completion'))
     refresh: Route = field(init=False, default=('crud_action', 'refresh'))
+    visible_columns: Route = field(init=False, default=('crud_action', 'visible_columns'))
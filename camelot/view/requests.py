@@ -78,6 +78,41 @@ class AbstractRequest(NamedDataclassSerializable):
         ))
         cls._stop_action(run_name, gui_run_name, response_handler, e)
 
+    @classmethod
+    def _send_background_steps(cls, run, run_name, step, response_handler, schedule=None):
+        """
+        Send the background steps of a blocking action step to the GUI, one
+        each time the model thread is idle, as long as the run waits for the
+        result of the blocking step.
+        """
+        from .responses import ActionStepped
+        steps = step.background_steps()
+        if steps is None:
+            return
+        if schedule is None:
+            from ..admin.model_context import _schedule_idle as schedule
+        gui_run_name = run.gui_run_name
+
+        def send_next():
+            # the step received its result, or the run was stopped
+            if (run.last_step is not step) or (run_name not in initial_naming_context):
+                steps.close()
+                return
+            try:
+                background_step = next(steps)
+            except StopIteration:
+                return
+            except Exception as e:
+                LOGGER.error('Unhandled exception in background steps', exc_info=e)
+                return
+            response_handler.send_response(ActionStepped(
+                run_name=run_name, gui_run_name=gui_run_name, blocking=False,
+                step=(type(background_step).__name__, background_step),
+            ))
+            schedule(send_next)
+
+        schedule(send_next)
+
     @classmethod
     def _iterate_until_blocking(cls, request_data, response_handler, cancel_handler):
         """Helper calling for generator methods.  The decorated method iterates
@@ -112,6 +147,7 @@ class AbstractRequest(NamedDataclassSerializable):
                     ))
                     if result.blocking:
                         # this step is blocking, interrupt the loop
+                        cls._send_background_steps(run, run_name, result, response_handler)
                         return
                 #
                 # Cancel requests can arrive asynchronously through non 
@@ -262,8 +298,8 @@ class Unbind(AbstractRequest):
 
     @classmethod
     def execute(cls, request_data, response_handler, cancel_handler):
-        for lease in request_data['names']:
-            try:
-                initial_naming_context.unbind(tuple(lease))
-            except NameNotFoundException:
-                LOGGER.warn('received unbind request for non bound lease : {}'.format(lease))
+        not_found = initial_naming_context.unbind_all(
+            tuple(lease) for lease in request_data['names']
+        )
+        for lease in not_found:
+            LOGGER.warn('received unbind request for non bound lease : {}'.format(lease))